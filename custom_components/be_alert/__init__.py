@@ -1,30 +1,76 @@
 """Init for BE Alert integration."""
 
+import asyncio
 import logging
+from collections.abc import Mapping
 from datetime import timedelta
+from pathlib import Path
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ENTITY_ID
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 import homeassistant.helpers.config_validation as cv
+from .archive import FeedArchive, archive_body_listener
 from .data import BeAlertFetcher
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .entity_helpers import (
+    _remove_sensor_entities,
+    _sensor_key,
+    _tracked_points,
+)
+from .events import BeAlertEventDispatcher
+from .matching import async_match_locations
+from .tracking import BeAlertPathTracker
+from .views import BeAlertGeoJsonView
+from .const import (
+    ARCHIVE_DIR,
+    ARCHIVE_MAX_BYTES,
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MAX_STALENESS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 _LOGGER.warning("BE Alert __init__.py loaded")
 
+PLATFORMS = ["sensor", "binary_sensor", "geo_location"]
+
 # Define an empty schema because this integration is configured via the UI
 # pylint: disable=invalid-name
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
-async def async_setup(_hass: HomeAssistant, _config: dict) -> bool:
-    """Legacy YAML setup (not used, return True)."""
+async def async_setup(hass: HomeAssistant, _config: dict) -> bool:
+    """Set up the BE Alert component (YAML configuration is not used)."""
     _LOGGER.warning("BE Alert async_setup called")
+    hass.http.register_view(BeAlertGeoJsonView(hass))
     return True
 
 
+def _tracked_entity_ids(options: Mapping[str, Any]) -> list[str]:
+    """Return the entity ids of all configured location sensors."""
+    return [
+        sensor[CONF_ENTITY_ID]
+        for sensor in options.get("sensors", [])
+        if sensor.get(CONF_ENTITY_ID)
+    ]
+
+
+def _body_listener(hass: HomeAssistant, options: Mapping[str, Any]):
+    """Return the feed archive listener if recording is enabled."""
+    if not options.get("record_feed", False):
+        return None
+    archive = FeedArchive(
+        Path(hass.config.path(ARCHIVE_DIR)), ARCHIVE_MAX_BYTES
+    )
+    _LOGGER.warning(
+        "__init__: Recording feed bodies to %s.", archive.directory
+    )
+    return archive_body_listener(hass, archive)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up BE Alert from a config entry."""
     _LOGGER.warning(
@@ -35,33 +81,73 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
 
-    # Create a new coordinator for this config entry.
-    # This ensures that on every reload, we get a fresh coordinator with the
-    # correct settings.
+    # Create a new coordinator for this config entry. Option changes are
+    # applied to it in place by async_update_options.
     session = async_get_clientsession(hass)
-    fetcher = BeAlertFetcher(session)
+    max_staleness = entry.options.get(
+        "max_staleness", DEFAULT_MAX_STALENESS
+    )
+    fetcher = BeAlertFetcher(
+        session,
+        timedelta(minutes=max_staleness),
+        fetch_details=entry.options.get("fetch_details", False),
+        streaming=entry.options.get("streaming_parse", False),
+        tracked_points=lambda: _tracked_points(
+            hass, entry.options.get("sensors", [])
+        ),
+    )
+    fetcher.body_listener = _body_listener(hass, entry.options)
 
     scan_interval = entry.options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
     _LOGGER.warning(
         "__init__.async_setup_entry: Using scan_interval of %s minutes.",
         scan_interval,
     )
+
+    # Refreshes can overlap (the background first refresh and a manual or
+    # service refresh); run them one at a time so the location matches
+    # always belong to the alerts the listeners see
+    update_lock = asyncio.Lock()
+
+    async def async_update() -> None:
+        """Fetch the feeds, then match every tracked location."""
+        async with update_lock:
+            await fetcher.async_update()
+            await async_match_locations(
+                hass,
+                fetcher,
+                entry.options.get("sensors", []),
+                entry.options.get("parallel_matching", True),
+            )
+
     coordinator = DataUpdateCoordinator(
         hass,
         _LOGGER,
         name=DOMAIN,
-        update_method=fetcher.async_update,
+        update_method=async_update,
         update_interval=timedelta(minutes=scan_interval),
     )
-    await coordinator.async_config_entry_first_refresh()
-    _LOGGER.warning(
-        "__init__.async_setup_entry: Coordinator initial refresh complete."
+    # Fire alert lifecycle events after every refresh
+    dispatcher = BeAlertEventDispatcher(hass, entry, fetcher)
+    entry.async_on_unload(
+        coordinator.async_add_listener(dispatcher.async_handle_update)
     )
 
-    # Store the coordinator and fetcher scoped to this config entry
+    # Detect alert areas crossed between two position updates
+    path_tracker = BeAlertPathTracker(hass, fetcher)
+    path_tracker.async_track(_tracked_entity_ids(entry.options))
+    entry.async_on_unload(path_tracker.async_stop)
+
+    # Store the coordinator and fetcher scoped to this config entry, with
+    # the options they were set up with and the platform callbacks used to
+    # add entities for sensors added later through the options
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "fetcher": fetcher,
+        "path_tracker": path_tracker,
+        "update_lock": update_lock,
+        "options": dict(entry.options),
+        "add_sensors": {},
     }
 
     # Register the update service if it doesn't exist yet
@@ -80,13 +166,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Listen for option changes
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
-    # Forward setup to the sensor platform (Standard correct format)
+    # Forward setup to the entity platforms (Standard correct format)
     _LOGGER.warning(
-        "__init__.async_setup_entry: Forwarding setup to sensor and "
-        "binary_sensor platforms."
+        "__init__.async_setup_entry: Forwarding setup to %s platforms.",
+        ", ".join(PLATFORMS),
+    )
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Run the first fetch in the background so a slow feed does not delay
+    # Home Assistant startup. Entities show their restored (or unknown)
+    # state until it completes.
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
     )
-    await hass.config_entries.async_forward_entry_setups(
-        entry, ["sensor", "binary_sensor"]
+    _LOGGER.warning(
+        "__init__.async_setup_entry: Scheduled initial coordinator refresh."
     )
 
     return True
@@ -95,19 +189,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_update_options(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> None:
-    """Handle options update."""
+    """Apply changed options to the running entry without a reload.
+
+    The fetcher and its parsed alerts are kept. Settings are applied to
+    the fetcher and coordinator in place, and only the entities of added
+    or removed sensors are created or removed.
+    """
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    previous = entry_data["options"]
+    options = entry_data["options"] = dict(entry.options)
+    coordinator = entry_data["coordinator"]
+    fetcher = entry_data["fetcher"]
     _LOGGER.warning(
-        "__init__.async_update_options: Options updated, reloading integr."
+        "__init__.async_update_options: Applying options for entry %s.",
+        entry.entry_id,
+    )
+
+    # The new interval is used from the next scheduled refresh on
+    coordinator.update_interval = timedelta(
+        minutes=options.get("scan_interval", DEFAULT_SCAN_INTERVAL)
     )
-    await hass.config_entries.async_reload(entry.entry_id)
+    fetcher.max_staleness = timedelta(
+        minutes=options.get("max_staleness", DEFAULT_MAX_STALENESS)
+    )
+    fetcher.fetch_details = options.get("fetch_details", False)
+    fetcher.streaming = options.get("streaming_parse", False)
+    if options.get("record_feed", False) != previous.get(
+        "record_feed", False
+    ):
+        fetcher.body_listener = _body_listener(hass, options)
+
+    old_sensors = {
+        _sensor_key(sensor): sensor
+        for sensor in previous.get("sensors", [])
+    }
+    new_sensors = {
+        _sensor_key(sensor): sensor for sensor in options.get("sensors", [])
+    }
+    removed = [
+        sensor
+        for key, sensor in old_sensors.items()
+        if key not in new_sensors
+    ]
+    added = [
+        sensor
+        for key, sensor in new_sensors.items()
+        if key not in old_sensors
+    ]
+    if removed:
+        _remove_sensor_entities(hass, entry.entry_id, removed)
+        for sensor in removed:
+            fetcher.location_matches.pop(sensor.get(CONF_ENTITY_ID), None)
+    if added:
+        for async_add_sensors in entry_data["add_sensors"].values():
+            async_add_sensors(added)
+    if added or removed:
+        entry_data["path_tracker"].async_track(_tracked_entity_ids(options))
+    _LOGGER.warning(
+        "__init__.async_update_options: %d sensor(s) added, %d removed.",
+        len(added),
+        len(removed),
+    )
+
+    # Expiry and detail fetching only change what the next update keeps
+    if fetcher.has_data and (
+        options.get("max_staleness") != previous.get("max_staleness")
+        or (fetcher.fetch_details and not previous.get("fetch_details"))
+    ):
+        await coordinator.async_request_refresh()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a BE Alert config entry."""
     _LOGGER.warning("Unloading BE Alert entry %s", entry.entry_id)
-    platforms = ["sensor", "binary_sensor"]
     unload_ok = await hass.config_entries.async_unload_platforms(
-        entry, platforms
+        entry, PLATFORMS
     )
 
     if unload_ok:
@@ -0,0 +1,274 @@
+"""Feed archive and replay source for the BE Alert integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import gzip
+import hashlib
+import logging
+import os
+from pathlib import Path
+import threading
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as ha_dt
+
+from .const import STREAM_CHUNK_SIZE
+from .models import _slug
+from .sources import BeAlertSource
+
+_LOGGER = logging.getLogger(__name__)
+
+_SUFFIX = ".json.gz"
+
+
+@dataclass
+class ArchivedFeed:
+    """A single recorded feed body."""
+
+    path: Path
+    source: str
+    fetched_at: datetime
+    duration: float
+    sha256: str
+    size: int
+
+
+def _parse_name(path: Path) -> ArchivedFeed | None:
+    """Parse ``<epoch ms>-<duration ms>-<sha256>-<source>.json.gz``."""
+    if not path.name.endswith(_SUFFIX):
+        return None
+    try:
+        stamp, duration, sha256, source = path.name[: -len(_SUFFIX)].split(
+            "-", 3
+        )
+        return ArchivedFeed(
+            path=path,
+            source=source,
+            fetched_at=datetime.fromtimestamp(
+                int(stamp) / 1000, tz=timezone.utc
+            ),
+            duration=int(duration) / 1000,
+            sha256=sha256,
+            size=path.stat().st_size,
+        )
+    except (ValueError, OSError):
+        return None
+
+
+class FeedArchive:
+    """Rolling on-disk archive of distinct raw feed bodies.
+
+    Every body is stored gzip-compressed in its own file; the file name
+    holds the fetch time, fetch duration, content hash and source, so no
+    separate index has to be kept consistent. A body identical to the
+    last recorded one of the same source is skipped. Once the archive
+    grows beyond ``max_bytes`` the oldest files are removed.
+
+    All methods do blocking file I/O and must run in the executor.
+    Recording is serialized, so bodies of concurrent fetches can be
+    recorded from several executor threads.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        """Initialize the archive."""
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._last_hash: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def entries(self, source: str | None = None) -> list[ArchivedFeed]:
+        """Return the archived feeds, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        entries = [
+            entry
+            for path in self.directory.iterdir()
+            if (entry := _parse_name(path)) is not None
+            and (source is None or entry.source == _slug(source))
+        ]
+        entries.sort(key=lambda entry: entry.path.name)
+        return entries
+
+    def record(
+        self,
+        source: str,
+        raw: bytes,
+        fetched_at: datetime,
+        duration: float,
+    ) -> bool:
+        """Store a feed body unless it equals the previous one.
+
+        Return True if a new file was written. A write error is logged
+        and the body is not recorded.
+        """
+        sha256 = hashlib.sha256(raw).hexdigest()[:32]
+        source_slug = _slug(source)
+        stamp = int(fetched_at.timestamp() * 1000)
+        name = f"{stamp:013d}-{int(duration * 1000)}-{sha256}-{source_slug}"
+        path = self.directory / f"{name}{_SUFFIX}"
+        tmp_path = path.with_suffix(".tmp")
+        with self._lock:
+            if self._last_hash is None:
+                self._last_hash = {
+                    entry.source: entry.sha256 for entry in self.entries()
+                }
+            if self._last_hash.get(source_slug) == sha256:
+                return False
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                tmp_path.write_bytes(gzip.compress(raw, compresslevel=6))
+                os.replace(tmp_path, path)
+            except OSError as err:
+                _LOGGER.warning(
+                    "FeedArchive: could not record %s: %s", path, err
+                )
+                with suppress(OSError):
+                    tmp_path.unlink(missing_ok=True)
+                return False
+            self._last_hash[source_slug] = sha256
+            self._evict()
+        return True
+
+    def _evict(self) -> None:
+        """Remove the oldest files until the archive fits its size.
+
+        The newest file is always kept.
+        """
+        entries = self.entries()
+        total = sum(entry.size for entry in entries)
+        for entry in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.path.unlink()
+            except OSError:
+                _LOGGER.warning(
+                    "FeedArchive: could not remove %s", entry.path
+                )
+                continue
+            total -= entry.size
+
+    @staticmethod
+    def read(entry: ArchivedFeed) -> bytes:
+        """Return the raw feed body of an archived entry."""
+        return gzip.decompress(entry.path.read_bytes())
+
+
+def archive_body_listener(
+    hass: HomeAssistant, archive: FeedArchive
+) -> Callable[[BeAlertSource, bytes, float], None]:
+    """Return a source body listener that records into the archive."""
+
+    def _record(source: BeAlertSource, raw: bytes, duration: float) -> None:
+        hass.async_add_executor_job(
+            archive.record, source.name, raw, ha_dt.utcnow(), duration
+        )
+
+    return _record
+
+
+# pylint: disable-next=too-many-instance-attributes
+class ReplaySource(BeAlertSource):
+    """Source that plays back archived bodies of another source.
+
+    Every fetch returns the next recorded body, parsed by the wrapped
+    source. ``speed`` scales the recorded fetch duration (``0`` replays
+    without delay). Expiry uses the recorded fetch time instead of the
+    clock, so a replay gives the same alerts every time it runs. Once
+    the archive is exhausted further fetches keep the last alerts, like
+    an unchanged feed.
+    """
+
+    def __init__(
+        self, archive: FeedArchive, source: BeAlertSource, speed: float = 0
+    ) -> None:
+        """Initialize the replay source."""
+        super().__init__()
+        self.name = source.name
+        self.url = f"replay:{archive.directory}"
+        self.stream_key = source.stream_key
+        self._archive = archive
+        self._source = source
+        self._speed = speed
+        self._entries: list[ArchivedFeed] | None = None
+        self._position = 0
+
+    @property
+    def current(self) -> ArchivedFeed | None:
+        """Return the last replayed entry."""
+        if not self._entries or not self._position:
+            return None
+        return self._entries[self._position - 1]
+
+    @property
+    def upcoming(self) -> ArchivedFeed | None:
+        """Return the entry the next fetch will replay, once loaded."""
+        if self._entries is None or self._position >= len(self._entries):
+            return None
+        return self._entries[self._position]
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of entries not replayed yet."""
+        if self._entries is None:
+            return len(self._archive.entries(self.name))
+        return len(self._entries) - self._position
+
+    def _now(self) -> datetime:
+        """Return the recorded fetch time of the current entry."""
+        if (current := self.current) is None:
+            return super()._now()
+        return current.fetched_at
+
+    def parse(self, data: Any) -> list[dict]:
+        """Parse a body with the wrapped source."""
+        return self._source.parse(data)
+
+    def parse_item(self, item: Any) -> dict:
+        """Parse a streamed item with the wrapped source."""
+        return self._source.parse_item(item)
+
+    def _parse_stream(self, entry: ArchivedFeed, key: str) -> list[dict]:
+        """Parse an archived body chunk by chunk, like a download."""
+        stream = self._stream_parser(key)
+        alerts: list[dict] = []
+        with gzip.open(entry.path) as body:
+            while chunk := body.read(STREAM_CHUNK_SIZE):
+                alerts.extend(stream.feed(chunk))
+        alerts.extend(stream.close())
+        return alerts
+
+    async def _async_fetch_once(
+        self, session: aiohttp.ClientSession
+    ) -> bool:
+        """Return the next archived body instead of fetching."""
+        if self._entries is None:
+            self._entries = await asyncio.to_thread(
+                self._archive.entries, self.name
+            )
+        if self._position >= len(self._entries):
+            return False
+        entry = self._entries[self._position]
+        self._position += 1
+        if self._speed:
+            await asyncio.sleep(entry.duration / self._speed)
+        if self.has_data and entry.sha256 == self._body_hash:
+            return False
+        if self.streaming and self.stream_key is not None:
+            self._set_alerts(
+                await asyncio.to_thread(
+                    self._parse_stream, entry, self.stream_key
+                )
+            )
+        else:
+            self._store(await asyncio.to_thread(self._archive.read, entry))
+        self._body_hash = entry.sha256
+        return True
@@ -9,11 +9,15 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_OFF, STATE_ON
 
-from .const import DOMAIN, LOCATION_SOURCE_DEVICE, LOCATION_SOURCE_ZONE
+from .const import LOCATION_SOURCE_DEVICE, LOCATION_SOURCE_ZONE
 from .models import BeAlertLocationSensorConfig
 from .sensor import BeAlertLocationEntity
-from .entity_helpers import _create_location_entities
+from .entity_helpers import (
+    _async_register_add_sensors,
+    _create_location_entities,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,12 +33,25 @@ async def async_setup_entry(
         entry.entry_id,
     )
 
-    entry_data = hass.data[DOMAIN][entry.entry_id]
-    coordinator = entry_data["coordinator"]
-    fetcher = entry_data["fetcher"]
-    entities_to_add: list[BinarySensorEntity] = []
+    async_add_sensors = _async_register_add_sensors(
+        hass,
+        entry.entry_id,
+        "binary_sensor",
+        _create_entities_from_config,
+        async_add_entities,
+    )
+    async_add_sensors(entry.options.get("sensors", []))
 
-    configured_sensors = entry.options.get("sensors", [])
+
+def _create_entities_from_config(
+    hass: HomeAssistant,
+    entry_id: str,
+    coordinator,
+    fetcher,
+    configured_sensors,
+) -> list[BinarySensorEntity]:
+    """Create binary sensor entities based on the configuration."""
+    entities_to_add: list[BinarySensorEntity] = []
     for sensor_config in configured_sensors:
         sensor_type = sensor_config.get("type")
 
@@ -42,7 +59,7 @@ async def async_setup_entry(
             # _create_location_entities returns both sensor and binary_sensor
             # Filter for BinarySensorEntity here.
             location_entities = _create_location_entities(
-                hass, entry.entry_id, coordinator, fetcher, sensor_config
+                hass, entry_id, coordinator, fetcher, sensor_config
             )
             binary_sensor_entities = [
                 e
@@ -51,7 +68,7 @@ async def async_setup_entry(
             ]
             entities_to_add.extend(binary_sensor_entities)
 
-    async_add_entities(entities_to_add, True)
+    return entities_to_add
 
 
 class BeAlertLocationBinarySensor(BeAlertLocationEntity, BinarySensorEntity):
@@ -67,6 +84,10 @@ class BeAlertLocationBinarySensor(BeAlertLocationEntity, BinarySensorEntity):
         )
 
     @property
-    def is_on(self) -> bool:
+    def is_on(self) -> bool | None:
         """Return true if there are active alerts for the location."""
+        if not self.config.fetcher.has_data:
+            if self._restored_state in (STATE_ON, STATE_OFF):
+                return self._restored_state == STATE_ON
+            return None
         return len(self._matches) > 0
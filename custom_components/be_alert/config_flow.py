@@ -16,6 +16,7 @@ from .const import (
     LOCATION_SOURCE_DEVICE,
     LOCATION_SOURCE_ZONE,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MAX_STALENESS,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -98,17 +99,25 @@ class BEAlertOptionsFlow(config_entries.OptionsFlow):
         """Handle the global settings for the integration.
 
         This step allows the user to configure settings like the polling
-        interval.
+        interval. The maximum staleness must cover at least one polling
+        interval, or alerts would be cleared on every failed poll.
         """
         _LOGGER.warning("OptionsFlow.async_step_settings: Started.")
         options = dict(self._entry.options or {})
+        errors = {}
         if user_input is not None:
             _LOGGER.warning(
                 "OptionsFlow.async_step_settings: User input received: %s",
                 user_input,
             )
             new_options = {**options, **user_input}
-            return self.async_create_entry(title="", data=new_options)
+            if new_options.get(
+                "max_staleness", DEFAULT_MAX_STALENESS
+            ) < new_options.get("scan_interval", DEFAULT_SCAN_INTERVAL):
+                errors["base"] = "max_staleness_too_short"
+            else:
+                return self.async_create_entry(title="", data=new_options)
+            options = new_options
 
         schema = vol.Schema(
             {
@@ -118,11 +127,34 @@ class BEAlertOptionsFlow(config_entries.OptionsFlow):
                         "scan_interval", DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Optional(
+                    "max_staleness",
+                    default=options.get(
+                        "max_staleness", DEFAULT_MAX_STALENESS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Optional(
+                    "fetch_details",
+                    default=options.get("fetch_details", False),
+                ): bool,
+                vol.Optional(
+                    "parallel_matching",
+                    default=options.get("parallel_matching", True),
+                ): bool,
+                vol.Optional(
+                    "streaming_parse",
+                    default=options.get("streaming_parse", False),
+                ): bool,
+                vol.Optional(
+                    "record_feed",
+                    default=options.get("record_feed", False),
+                ): bool,
             }
         )
         return self.async_show_form(
             step_id="settings",
             data_schema=schema,
+            errors=errors,
         )
 
     async def async_step_add_sensor(
@@ -8,6 +8,42 @@ LOCATION_SOURCE_DEVICE = "device"
 LOCATION_SOURCE_ZONE = "zone"
 
 DEFAULT_SCAN_INTERVAL = 5  # Default polling interval in minutes
+# Minutes to keep serving the last good feed while fetches keep failing
+DEFAULT_MAX_STALENESS = 60
+
+FETCH_TIMEOUT = 15  # Seconds per fetch attempt
+FETCH_RETRIES = 3  # Attempts per poll before the feed is marked stale
+FETCH_BACKOFF_BASE = 2  # Seconds, doubled after every failed attempt
+FETCH_BACKOFF_MAX = 30  # Upper bound for a single backoff delay
+
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes read at a time when streaming a feed
+
+DETAIL_CONCURRENCY = 4  # Parallel CAP detail document downloads
+DETAIL_RETRY_INTERVAL = 30  # Minutes before a failed detail is fetched again
+
+PARALLEL_MATCH_WORKERS = 4  # Executor jobs used to match tracked locations
+PARALLEL_MATCH_MIN_CHUNK = 50  # Locations per job before splitting further
+
+# Simplification tolerance in degrees per GeoJSON level of detail, from
+# coarse (low zoom) to full resolution
+GEOJSON_LOD_TOLERANCES = (0.01, 0.002, 0.0005, 0.0)
+GEOJSON_LOD_MIN_ZOOM = (0, 8, 10, 12)  # Map zoom level where each LOD starts
+GEOJSON_CACHE_SIZE = 32  # Cached responses per feed generation
+
+# Opt-in archive of raw feed bodies, relative to the config directory
+ARCHIVE_DIR = "be_alert_archive"
+ARCHIVE_MAX_BYTES = 50 * 1024 * 1024  # Oldest bodies are removed beyond this
+
+INDEX_CELL_SIZE = 0.1  # Degrees per spatial index grid cell
+INDEX_MAX_CELLS = 4096  # Larger areas are always tested instead of indexed
+
+# Events fired on the Home Assistant event bus
+EVENT_ALERT_STARTED = "be_alert_started"
+EVENT_ALERT_UPDATED = "be_alert_updated"
+EVENT_ALERT_ENDED = "be_alert_ended"
+EVENT_ALERT_CROSSED = "be_alert_crossed"
+
+PATH_HISTORY_SIZE = 8  # Recent positions kept per tracked entity
 
 FEED_URL = (
     "https://publicalerts.be/CapGateway/feed?"
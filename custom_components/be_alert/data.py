@@ -3,97 +3,337 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
 import logging
+import time
 from typing import Any
+
 import aiohttp
-import shapely.geometry
-import shapely.errors
 
 from homeassistant.util import dt as ha_dt
 
-from .const import FEED_URL
+from .const import (
+    DEFAULT_MAX_STALENESS,
+    DETAIL_CONCURRENCY,
+    DETAIL_RETRY_INTERVAL,
+)
+from .geometry import AlertIndex
+from .models import AlertDiff
+from .sources import BeAlertSource, PublicAlertsBeSource
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def _parse_alert_item(item: dict[str, Any]) -> dict[str, Any]:
-    """Parse a single alert item from the feed into a structured dict."""
-    polygons = []
-    for area in item.get("area", []):
-        for coordset in area.get("coordinates", []):
-            if coordset.get("type") == "LineString":
-                points = [
-                    (p["x"], p["y"]) for p in coordset.get("coordinates", [])
-                ]
-                if len(points) >= 3:
-                    try:
-                        polygons.append(shapely.geometry.Polygon(points))
-                    except (shapely.errors.ShapelyError, ValueError):
-                        _LOGGER.warning(
-                            "BeAlertFetcher: invalid polygon points, skipping",
-                            exc_info=True,
-                        )
-    return {
-        "title": item.get("title"),
-        "link": item.get("link"),
-        "category": item.get("category"),
-        "pubDate": item.get("pubDate"),
-        "startDate": item.get("startDate"),
-        "expirationDate": item.get("expirationDate"),
-        "description": item.get("description"),
-        "polygons": polygons,
-    }
-
-
-class BeAlertFetcher:
-    """Fetch BE Alert feed and parse polygons with logging."""
-
-    def __init__(self, session: aiohttp.ClientSession):
+# The fetcher is the shared state of a config entry: feed, detail and
+# match state read by all entities
+class BeAlertFetcher:  # pylint: disable=too-many-instance-attributes
+    """Fetch BE Alert feeds and parse polygons with logging.
+
+    All sources are fetched concurrently over the shared session and their
+    alerts are merged, deduplicated by alert id, into one spatial index.
+    When a source fails its last good alerts are kept and marked stale.
+    Alerts then only disappear through their own expiration date, or once
+    the source is older than the configured maximum staleness.
+
+    With ``fetch_details`` enabled, the full CAP document is downloaded
+    for alerts whose coarse area contains a tracked location. Details are
+    cached per alert id and version and reused until the alert changes.
+    A failed download is not retried for that alert version until
+    ``DETAIL_RETRY_INTERVAL`` has passed.
+
+    Every time the alerts change the ``generation`` counter is raised, and
+    ``diff`` holds the alerts that started, changed or ended. Sources keep
+    their alert objects while the feed body is unchanged, so polling an
+    unchanged feed does not start a new generation.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        session: aiohttp.ClientSession,
+        max_staleness: timedelta = timedelta(minutes=DEFAULT_MAX_STALENESS),
+        *,
+        sources: list[BeAlertSource] | None = None,
+        fetch_details: bool = False,
+        tracked_points: Callable[[], list[tuple[float, float]]] | None = None,
+        body_listener: Callable[[BeAlertSource, bytes, float], Any]
+        | None = None,
+        streaming: bool = False,
+    ):
         self._session = session
+        self.max_staleness = max_staleness
+        self.sources: list[BeAlertSource] = sources or [
+            PublicAlertsBeSource()
+        ]
+        self.fetch_details = fetch_details
+        self._tracked_points = tracked_points
+        self.body_listener = body_listener
+        self.streaming = streaming
         self.alerts: list[dict] = []
         self.last_checked: str | None = None
+        self.generation = 0
+        self.diff = AlertDiff()
+        # Location entity state writes skipped because nothing changed
+        self.suppressed_writes = 0
+        # Tracked entity_id -> ((lon, lat), matching alerts), filled in by
+        # the coordinator after every refresh
+        self.location_matches: dict[
+            str, tuple[tuple[float, float], list[dict]]
+        ] = {}
+        self._index = AlertIndex([])
+        # Alerts as merged from the sources, before detail enrichment
+        self._feed_alerts: list[dict] = []
+        self._feed_index = AlertIndex([])
+        self._details: dict[tuple[str, str | None], dict] = {}
+        # Alert version -> monotonic time of its last failed detail fetch
+        self._detail_failures: dict[tuple[str, str | None], float] = {}
+        self._detail_semaphore = asyncio.Semaphore(DETAIL_CONCURRENCY)
+
+    @property
+    def body_listener(
+        self,
+    ) -> Callable[[BeAlertSource, bytes, float], Any] | None:
+        """Return the callback receiving every raw feed body."""
+        return self._body_listener
+
+    @body_listener.setter
+    def body_listener(
+        self, listener: Callable[[BeAlertSource, bytes, float], Any] | None
+    ) -> None:
+        """Pass raw feed bodies of all sources to a callback."""
+        self._body_listener = listener
+        for source in self.sources:
+            source.body_listener = listener
+
+    @property
+    def streaming(self) -> bool:
+        """Return True if feeds are parsed while they are downloaded."""
+        return self._streaming
+
+    @streaming.setter
+    def streaming(self, streaming: bool) -> None:
+        """Enable or disable streaming parsing for all sources."""
+        self._streaming = streaming
+        for source in self.sources:
+            source.streaming = streaming
+
+    @property
+    def has_data(self) -> bool:
+        """Return True once any source has been fetched successfully."""
+        return any(source.has_data for source in self.sources)
+
+    @property
+    def stale(self) -> bool:
+        """Return True if any source is serving older data."""
+        return any(source.stale for source in self.sources)
+
+    @property
+    def last_success(self) -> datetime | None:
+        """Return the oldest last-success time of all fetched sources."""
+        times = [
+            source.last_success
+            for source in self.sources
+            if source.last_success is not None
+        ]
+        return min(times) if times else None
+
+    @property
+    def feed_age(self) -> float | None:
+        """Return the age of the oldest good feed in seconds."""
+        if (last_success := self.last_success) is None:
+            return None
+        return (ha_dt.utcnow() - last_success).total_seconds()
+
+    @property
+    def consecutive_failures(self) -> int:
+        """Return the longest failure streak of all sources."""
+        return max(source.consecutive_failures for source in self.sources)
+
+    @property
+    def total_failures(self) -> int:
+        """Return the number of failed polls over all sources."""
+        return sum(source.total_failures for source in self.sources)
+
+    def _merge(self) -> None:
+        """Merge the alerts of all sources and rebuild the index."""
+        alerts: list[dict] = []
+        seen: set[str] = set()
+        for source in self.sources:
+            for alert in source.alerts:
+                alert_id = alert["id"]
+                if alert_id is not None:
+                    if alert_id in seen:
+                        continue
+                    seen.add(alert_id)
+                alerts.append(alert)
+        self._feed_alerts = alerts
+        self._feed_index = AlertIndex(alerts)
+
+    @staticmethod
+    def _detail_key(alert: dict) -> tuple[str, str | None]:
+        """Return the cache key of an alert version."""
+        return alert["id"], alert.get("pubDate")
+
+    async def _async_fetch_detail(
+        self, source: BeAlertSource, alert: dict
+    ) -> None:
+        """Fetch and cache the CAP detail of one alert."""
+        async with self._detail_semaphore:
+            detail = await source.async_fetch_detail(self._session, alert)
+        key = self._detail_key(alert)
+        if detail is None:
+            self._detail_failures[key] = time.monotonic()
+        else:
+            self._details[key] = detail
+            self._detail_failures.pop(key, None)
+
+    async def _async_update_details(self) -> bool:
+        """Fetch missing details for alerts near tracked locations.
+
+        Return True if new details were added to the cache.
+        """
+        current = {self._detail_key(alert) for alert in self._feed_alerts}
+        for cache in (self._details, self._detail_failures):
+            for key in [key for key in cache if key not in current]:
+                del cache[key]
+        if not self.fetch_details or self._tracked_points is None:
+            return False
+
+        retry_before = time.monotonic() - DETAIL_RETRY_INTERVAL * 60
+        candidates: dict[tuple[str, str | None], dict] = {}
+        for lon, lat in self._tracked_points():
+            for alert in self._feed_index.query_point(lon, lat):
+                key = self._detail_key(alert)
+                if (
+                    alert["id"] is not None
+                    and key not in self._details
+                    and self._detail_failures.get(key, retry_before)
+                    <= retry_before
+                ):
+                    candidates[key] = alert
+        if not candidates:
+            return False
+
+        sources = {source.name: source for source in self.sources}
+        _LOGGER.debug(
+            "BeAlertFetcher: fetching CAP details for %d alerts",
+            len(candidates),
+        )
+        await asyncio.gather(
+            *(
+                self._async_fetch_detail(sources[alert["source"]], alert)
+                for alert in candidates.values()
+                if alert.get("source") in sources
+            )
+        )
+        return any(key in self._details for key in candidates)
+
+    def _apply_details(self) -> None:
+        """Replace feed alerts by their cached details and reindex.
+
+        Without any detail the index of the feed alerts is reused.
+        """
+        previous = self.alerts
+        if self._details:
+            self.alerts = [
+                self._details.get(self._detail_key(alert), alert)
+                for alert in self._feed_alerts
+            ]
+            self._index = AlertIndex(self.alerts)
+        else:
+            self.alerts = self._feed_alerts
+            self._index = self._feed_index
+        self.diff = self._diff(previous, self.alerts)
+        if len(previous) != len(self.alerts) or any(
+            old is not new for old, new in zip(previous, self.alerts)
+        ):
+            self.generation += 1
+
+    @staticmethod
+    def _alert_changed(old: dict, new: dict) -> bool:
+        """Return True if an alert's fields or areas changed.
+
+        Alert objects are kept while nothing changed, so only a new object
+        is compared field by field, and its areas by their coordinates.
+        """
+        if old is new:
+            return False
+        if old.keys() != new.keys() or any(
+            old[key] != new[key] for key in old if key != "areas"
+        ):
+            return True
+        return [area.coords for area in old["areas"]] != [
+            area.coords for area in new["areas"]
+        ]
+
+    def _diff(self, previous: list[dict], current: list[dict]) -> AlertDiff:
+        """Compare two alert lists by alert id and content."""
+        old = {a["id"]: a for a in previous if a["id"] is not None}
+        new = {a["id"]: a for a in current if a["id"] is not None}
+        return AlertDiff(
+            started=[a for alert_id, a in new.items() if alert_id not in old],
+            updated=[
+                a
+                for alert_id, a in new.items()
+                if alert_id in old and self._alert_changed(old[alert_id], a)
+            ],
+            ended=[a for alert_id, a in old.items() if alert_id not in new],
+        )
 
     async def async_update(self) -> None:
-        """Fetch feed and parse polygons; update last_checked time."""
+        """Fetch all sources and parse polygons; update last_checked."""
         _LOGGER.warning("BeAlertFetcher.async_update: starting fetch")
         self.last_checked = ha_dt.now().isoformat()
 
-        try:
-            async with self._session.get(
-                FEED_URL, timeout=aiohttp.ClientTimeout(total=15)
-            ) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
-        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
-            _LOGGER.error("BeAlertFetcher.async_update: fetch failed: %s", err)
-            self.alerts = []
-            return
-
-        self.alerts = [
-            _parse_alert_item(item) for item in data.get("items", [])
+        results = await asyncio.gather(
+            *(source.async_fetch(self._session) for source in self.sources)
+        )
+        expired = [
+            source.expire(self.max_staleness) for source in self.sources
         ]
+        merged = any(results) or any(expired)
+        self.diff = AlertDiff()
+        if merged:
+            self._merge()
+        if await self._async_update_details() or merged:
+            self._apply_details()
         _LOGGER.warning(
-            "BeAlertFetcher.async_update: finished fetch, %d alerts parsed",
+            "BeAlertFetcher.async_update: finished fetch, %d alerts from "
+            "%d source(s)",
             len(self.alerts),
+            len(self.sources),
         )
 
+    def match_points_job(
+        self,
+    ) -> Callable[[list[tuple[float, float]]], list[list[dict]]]:
+        """Return a thread-safe matcher bound to the current index."""
+        return self._index.query_points
+
+    def alerts_crossed(
+        self, start: tuple[float, float], end: tuple[float, float]
+    ) -> list[dict]:
+        """Return alerts crossed between two (lon, lat) positions.
+
+        Only alerts whose area the segment passes through without
+        containing either position are returned; those are missed by
+        point matching.
+        """
+        if start == end:
+            return []
+        return [
+            alert
+            for alert in self._index.query_segment(start, end)
+            if not any(
+                area.contains(*start) or area.contains(*end)
+                for area in alert["areas"]
+            )
+        ]
+
     def alerts_affecting_point(
         self, lon: float | None, lat: float | None
     ) -> list[dict]:
         """Return list of alerts whose polygons contain the given point."""
         if lat is None or lon is None:
             return []
-        point = shapely.geometry.Point(lon, lat)
-        matches: list[dict] = []
-        for alert in self.alerts:
-            for poly in alert.get("polygons", []):
-                try:
-                    if poly.contains(point):
-                        matches.append(alert)
-                        break
-                except (shapely.errors.ShapelyError, ValueError):
-                    _LOGGER.warning(
-                        "BeAlertFetcher: polygon contains() failed",
-                        exc_info=True,
-                    )
-        return matches
+        return self._index.query_point(lon, lat)
@@ -4,6 +4,7 @@ Pylint is disabled for this file because it uses a standard HA pattern."""
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from typing import Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
     from .binary_sensor import BeAlertLocationBinarySensor  # noqa: F401, F403
 
 from homeassistant.const import CONF_ENTITY_ID
+from .const import DOMAIN, LOCATION_SOURCE_DEVICE, LOCATION_SOURCE_ZONE
 from .models import BeAlertLocationSensorConfig, _slug
 
 
@@ -39,8 +41,7 @@ def _create_location_entities(
         state.name if state and state.name else entity_id.split(".")[-1]
     )
     sensor_name = f"BE Alert {friendly_name}"
-    # Append '-loc' to the unique_id to break from old cached entities
-    sensor_unique_id = f"be_alert_loc_{_slug(entity_id)}"
+    sensor_unique_id = _location_unique_id(entity_id)
     config = BeAlertLocationSensorConfig(
         hass,
         fetcher,
@@ -53,3 +54,142 @@ def _create_location_entities(
     entities.append(BeAlertLocationSensor(config))
     entities.append(BeAlertLocationBinarySensor(config))
     return entities
+
+
+def _location_unique_id(entity_id: str) -> str:
+    """Return the unique_id of the location sensor for a tracked entity."""
+    # Append '-loc' to the unique_id to break from old cached entities
+    return f"be_alert_loc_{_slug(entity_id)}"
+
+
+def _sensor_key(sensor_config: dict[str, Any]) -> str | None:
+    """Return the key identifying a configured sensor in the options."""
+    if sensor_config.get("type") == "all":
+        return "all"
+    return sensor_config.get(CONF_ENTITY_ID)
+
+
+def _sensor_unique_ids(sensor_config: dict[str, Any]) -> set[str]:
+    """Return the unique_ids of the entities created for a sensor config."""
+    if sensor_config.get("type") == "all":
+        return {"be_alert_all"}
+    if sensor_config.get("type") in (
+        LOCATION_SOURCE_DEVICE,
+        LOCATION_SOURCE_ZONE,
+    ) and (entity_id := sensor_config.get(CONF_ENTITY_ID)):
+        unique_id = _location_unique_id(entity_id)
+        return {unique_id, f"{unique_id}_alerting"}
+    return set()
+
+
+def _remove_sensor_entities(
+    hass: "HomeAssistant",
+    entry_id: str,
+    sensor_configs: Iterable[dict[str, Any]],
+) -> None:
+    """Remove the entities and devices of removed sensor configs."""
+    from homeassistant.helpers import device_registry as dr
+    from homeassistant.helpers import entity_registry as er
+
+    unique_ids: set[str] = set()
+    for sensor_config in sensor_configs:
+        unique_ids |= _sensor_unique_ids(sensor_config)
+    registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(registry, entry_id):
+        if entity.unique_id in unique_ids:
+            registry.async_remove(entity.entity_id)
+
+    device_registry = dr.async_get(hass)
+    for sensor_config in sensor_configs:
+        if not (entity_id := sensor_config.get(CONF_ENTITY_ID)):
+            continue
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, _slug(entity_id))}
+        )
+        if device is not None and entry_id in device.config_entries:
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry_id
+            )
+
+
+def _async_register_add_sensors(
+    hass: "HomeAssistant",
+    entry_id: str,
+    platform: str,
+    create_entities: Callable[..., list],
+    async_add_entities: Callable[[list], None],
+) -> Callable[[list[dict[str, Any]]], None]:
+    """Register and return the callback adding a platform's new sensors."""
+    from homeassistant.core import callback
+
+    entry_data = hass.data[DOMAIN][entry_id]
+
+    @callback
+    def async_add_sensors(sensor_configs: list[dict[str, Any]]) -> None:
+        """Add the entities for sensors added in the options."""
+        if entities := create_entities(
+            hass,
+            entry_id,
+            entry_data["coordinator"],
+            entry_data["fetcher"],
+            sensor_configs,
+        ):
+            async_add_entities(entities)
+
+    entry_data["add_sensors"][platform] = async_add_sensors
+    return async_add_sensors
+
+
+def _get_coordinates(hass: "HomeAssistant", entity_id: str):
+    """Get lat and long for zone or device entity_id synchronously."""
+    if not entity_id:
+        return None
+    state = hass.states.get(entity_id)
+    if not state:
+        return None
+    if "latitude" in state.attributes and "longitude" in state.attributes:
+        return state.attributes["latitude"], state.attributes["longitude"]
+    return None
+
+
+def _tracked_locations(
+    hass: "HomeAssistant", configured_sensors: Iterable[dict[str, Any]]
+) -> tuple[list[str], list[tuple[float, float]]]:
+    """Return the entity ids and (lon, lat) of located tracked entities."""
+    entity_ids: list[str] = []
+    points: list[tuple[float, float]] = []
+    for sensor_config in configured_sensors:
+        entity_id = sensor_config.get(CONF_ENTITY_ID)
+        if entity_id and (coords := _get_coordinates(hass, entity_id)):
+            lat, lon = coords
+            entity_ids.append(entity_id)
+            points.append((lon, lat))
+    return entity_ids, points
+
+
+def _tracked_points(
+    hass: "HomeAssistant", configured_sensors: Iterable[dict[str, Any]]
+) -> list[tuple[float, float]]:
+    """Return (lon, lat) of every configured location with coordinates."""
+    return _tracked_locations(hass, configured_sensors)[1]
+
+
+# Fields only present once the full CAP document has been fetched
+_DETAIL_ATTRIBUTES = ("severity", "urgency", "certainty", "instruction")
+
+
+def _alert_attributes(alert: dict[str, Any]) -> dict[str, Any]:
+    """Return the state attributes describing a single alert."""
+    attrs = {
+        "title": alert["title"],
+        "link": alert["link"],
+        "category": alert["category"],
+        "pubDate": alert["pubDate"],
+        "startDate": alert["startDate"],
+        "expirationDate": alert["expirationDate"],
+        "description": alert["description"],
+    }
+    for key in _DETAIL_ATTRIBUTES:
+        if alert.get(key) is not None:
+            attrs[key] = alert[key]
+    return attrs
@@ -0,0 +1,186 @@
+"""Alert lifecycle events for the BE Alert integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_ENTITY_ID
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    EVENT_ALERT_ENDED,
+    EVENT_ALERT_STARTED,
+    EVENT_ALERT_UPDATED,
+)
+from .data import BeAlertFetcher
+from .entity_helpers import _get_coordinates
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _event_data(
+    alert: dict[str, Any], entity_ids: list[str], scope: str
+) -> dict[str, Any]:
+    """Return the compact event payload for an alert."""
+    return {
+        "alert_id": alert["id"],
+        "title": alert["title"],
+        "category": alert["category"],
+        "link": alert["link"],
+        "startDate": alert["startDate"],
+        "expirationDate": alert["expirationDate"],
+        "severity": alert.get("severity"),
+        "entity_ids": entity_ids,
+        "scope": scope,
+    }
+
+
+def _covering(matches: dict[str, set[str]], alert_id: str) -> list[str]:
+    """Return the tracked entities an alert covers."""
+    return [eid for eid, ids in matches.items() if alert_id in ids]
+
+
+def _location_changes(
+    previous: dict[str, set[str]],
+    current: dict[str, set[str]],
+    changed_ids: set[str],
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Return the entities that entered and left each unchanged alert."""
+    entered: dict[str, list[str]] = {}
+    left: dict[str, list[str]] = {}
+    for entity_id in current.keys() & previous.keys():
+        now_ids = current[entity_id]
+        old_ids = previous[entity_id]
+        for alert_id in now_ids - old_ids - changed_ids:
+            entered.setdefault(alert_id, []).append(entity_id)
+        for alert_id in old_ids - now_ids - changed_ids:
+            left.setdefault(alert_id, []).append(entity_id)
+    return entered, left
+
+
+class BeAlertEventDispatcher:  # pylint: disable=too-few-public-methods
+    """Fire alert lifecycle events from the fetcher's generation diff.
+
+    Feed-wide changes fire events with scope ``feed``; they list the
+    tracked entities inside the alert area. When an unchanged alert starts
+    or stops covering a tracked entity (for example because it moved), an
+    event with scope ``location`` lists only the entities that changed.
+    The first refresh with data only records the current state, so a
+    restart does not replay every active alert.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, fetcher: BeAlertFetcher
+    ) -> None:
+        """Initialize the dispatcher."""
+        self._hass = hass
+        self._entry = entry
+        self._fetcher = fetcher
+        self._primed = False
+        # Tracked entity_id -> ids of the alerts covering it
+        self._matches: dict[str, set[str]] = {}
+        self._alerts: dict[str, dict] = {}
+
+    def _current_matches(
+        self, alerts: dict[str, dict]
+    ) -> dict[str, set[str]]:
+        """Return the ids of current alerts covering every tracked entity."""
+        matches: dict[str, set[str]] = {}
+        for sensor_config in self._entry.options.get("sensors", []):
+            entity_id = sensor_config.get(CONF_ENTITY_ID)
+            if not entity_id:
+                continue
+            result = self._fetcher.location_matches.get(entity_id)
+            if result is not None:
+                matched = result[1]
+            elif (coords := _get_coordinates(self._hass, entity_id)) is None:
+                # Keep the last known matches while the source is unknown,
+                # without alerts that have ended in the meantime: their
+                # feed event already listed this entity
+                if entity_id in self._matches:
+                    matches[entity_id] = self._matches[entity_id] & (
+                        alerts.keys()
+                    )
+                continue
+            else:
+                lat, lon = coords
+                matched = self._fetcher.alerts_affecting_point(lon, lat)
+            matches[entity_id] = {
+                alert["id"] for alert in matched if alert["id"] in alerts
+            }
+        return matches
+
+    @callback
+    def _fire(
+        self,
+        event_type: str,
+        alert: dict[str, Any],
+        entity_ids: list[str],
+        scope: str,
+    ) -> None:
+        """Fire a single alert event."""
+        self._hass.bus.async_fire(
+            event_type, _event_data(alert, sorted(entity_ids), scope)
+        )
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Compare the new generation with the previous one."""
+        fetcher = self._fetcher
+        if not fetcher.has_data:
+            return
+        previous = self._matches
+        alerts = {a["id"]: a for a in fetcher.alerts if a["id"] is not None}
+        current = self._current_matches(alerts)
+        self._matches = current
+        previous_alerts, self._alerts = self._alerts, alerts
+        if not self._primed:
+            self._primed = True
+            return
+
+        diff = fetcher.diff
+        _LOGGER.debug(
+            "BeAlertEventDispatcher: generation %d, %d started, %d updated, "
+            "%d ended",
+            fetcher.generation,
+            len(diff.started),
+            len(diff.updated),
+            len(diff.ended),
+        )
+        for alert in diff.started:
+            self._fire(
+                EVENT_ALERT_STARTED,
+                alert,
+                _covering(current, alert["id"]),
+                "feed",
+            )
+        for alert in diff.updated:
+            self._fire(
+                EVENT_ALERT_UPDATED,
+                alert,
+                _covering(current, alert["id"]),
+                "feed",
+            )
+        for alert in diff.ended:
+            self._fire(
+                EVENT_ALERT_ENDED,
+                alert,
+                _covering(previous, alert["id"]),
+                "feed",
+            )
+
+        # Per-location changes for alerts that exist in both generations
+        changed_ids = {a["id"] for a in (*diff.started, *diff.ended)}
+        entered, left = _location_changes(previous, current, changed_ids)
+        for alert_id, entity_ids in entered.items():
+            if (started := alerts.get(alert_id)) is not None:
+                self._fire(
+                    EVENT_ALERT_STARTED, started, entity_ids, "location"
+                )
+        for alert_id, entity_ids in left.items():
+            # An id found in neither generation has no alert to report
+            ended = alerts.get(alert_id) or previous_alerts.get(alert_id)
+            if ended is not None:
+                self._fire(EVENT_ALERT_ENDED, ended, entity_ids, "location")
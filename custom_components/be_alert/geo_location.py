@@ -0,0 +1,246 @@
+"""BE Alert geo_location platform."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.components.geo_location import GeolocationEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfLength
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util.location import distance
+
+from .const import DOMAIN
+from .data import BeAlertFetcher
+from .geometry import AlertArea
+from .models import AlertDiff
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up BE Alert geolocation events from a config entry."""
+    _LOGGER.warning(
+        "geo_location.async_setup_entry: Started for entry %s.",
+        entry.entry_id,
+    )
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    manager = BeAlertGeolocationManager(
+        hass, entry, entry_data["fetcher"], async_add_entities
+    )
+    entry.async_on_unload(
+        entry_data["coordinator"].async_add_listener(
+            manager.async_handle_update
+        )
+    )
+    manager.async_handle_update()
+
+
+def _main_area(alert: dict[str, Any]) -> AlertArea | None:
+    """Return the area with the largest bounding box of an alert."""
+    if not alert["areas"]:
+        return None
+    return max(
+        alert["areas"],
+        key=lambda area: (area.bbox[2] - area.bbox[0])
+        * (area.bbox[3] - area.bbox[1]),
+    )
+
+
+def _place_alerts(areas: list[AlertArea]) -> None:
+    """Compute the representative points of the main alert areas.
+
+    Builds the polygons, so it runs in the executor.
+    """
+    for area in areas:
+        area.representative_point()
+
+
+def _alert_location(alert: dict[str, Any]) -> tuple[float, float] | None:
+    """Return the (lat, lon) position shown for an alert."""
+    if (area := _main_area(alert)) is None:
+        return None
+    lon, lat = area.representative_point()
+    return lat, lon
+
+
+# The coordinator listener is the only entry point
+class BeAlertGeolocationManager:  # pylint: disable=too-few-public-methods
+    """Keep one geolocation entity per alert in sync with the fetcher.
+
+    Only runs when the feed generation changed, and then applies the
+    fetcher's diff: entities are only created for alerts that started,
+    updated for alerts that changed and removed for alerts that ended, so
+    unchanged alerts cause no work and no state writes. The first update,
+    or one after a missed generation, compares all current alerts.
+
+    Entities are placed at a point inside the alert area. Computing it
+    builds the polygon, so the points are computed in the executor before
+    the changes are applied, one generation at a time.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        fetcher: BeAlertFetcher,
+        async_add_entities: AddEntitiesCallback,
+    ) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self._entry = entry
+        self._fetcher = fetcher
+        self._async_add_entities = async_add_entities
+        self._generation: int | None = None
+        self._entities: dict[str, BeAlertGeolocationEvent] = {}
+        # Applies the generations in the order they were seen
+        self._lock = asyncio.Lock()
+
+    @callback
+    def async_handle_update(self) -> None:
+        """Schedule the changes of a new feed generation."""
+        fetcher = self._fetcher
+        if fetcher.generation == self._generation:
+            return
+        diff: AlertDiff | None = None
+        if (
+            self._generation is not None
+            and fetcher.generation == self._generation + 1
+        ):
+            diff = fetcher.diff
+        self._generation = fetcher.generation
+        self._entry.async_create_task(
+            self._hass, self._async_apply(fetcher.alerts, diff)
+        )
+
+    async def _async_apply(
+        self, alerts: list[dict], diff: AlertDiff | None
+    ) -> None:
+        """Apply a generation diff, or sync all alerts without one."""
+        async with self._lock:
+            if diff is not None:
+                started, updated = diff.started, diff.updated
+                ended = diff.ended
+            else:
+                # First update, or a generation was missed
+                current = {alert["id"] for alert in alerts}
+                started, updated = alerts, []
+                ended = [
+                    entity.alert
+                    for alert_id, entity in self._entities.items()
+                    if alert_id not in current
+                ]
+            areas = [
+                area
+                for alert in (*started, *updated)
+                if (area := _main_area(alert)) is not None
+                and not area.has_point
+            ]
+            if areas:
+                await self._hass.async_add_executor_job(_place_alerts, areas)
+            self._async_update_entities(started, updated, ended)
+
+    @callback
+    def _async_update_entities(
+        self, started: list[dict], updated: list[dict], ended: list[dict]
+    ) -> None:
+        """Add, update and remove the entities of changed alerts."""
+        removed = 0
+        for alert in ended:
+            if (entity := self._entities.pop(alert["id"], None)) is not None:
+                self._hass.async_create_task(
+                    entity.async_remove(force_remove=True)
+                )
+                removed += 1
+
+        added: list[BeAlertGeolocationEvent] = []
+        changed = 0
+        for alert in (*started, *updated):
+            if (alert_id := alert["id"]) is None:
+                continue
+            entity = self._entities.get(alert_id)
+            if not alert["areas"]:
+                # Nothing to place on the map
+                if entity is not None:
+                    del self._entities[alert_id]
+                    self._hass.async_create_task(
+                        entity.async_remove(force_remove=True)
+                    )
+                    removed += 1
+            elif entity is None:
+                entity = BeAlertGeolocationEvent(self._hass, alert)
+                self._entities[alert_id] = entity
+                added.append(entity)
+            else:
+                entity.async_update_alert(alert)
+                changed += 1
+        if added:
+            self._async_add_entities(added)
+        _LOGGER.debug(
+            "BeAlertGeolocationManager: %d added, %d updated, %d removed",
+            len(added),
+            changed,
+            removed,
+        )
+
+
+class BeAlertGeolocationEvent(GeolocationEvent):
+    """Geolocation event for a single alert, placed inside its area."""
+
+    _attr_should_poll = False
+    _attr_source = DOMAIN
+    _attr_icon = "mdi:alert"
+    _attr_unit_of_measurement = UnitOfLength.KILOMETERS
+
+    def __init__(self, hass: HomeAssistant, alert: dict[str, Any]) -> None:
+        """Initialize the event entity."""
+        self.hass = hass
+        self.alert = alert
+        self._apply_alert(alert)
+
+    def _apply_alert(self, alert: dict[str, Any]) -> None:
+        """Update the entity attributes from an alert."""
+        self.alert = alert
+        self._attr_name = alert["title"]
+        if (location := _alert_location(alert)) is None:
+            return
+        self._attr_latitude, self._attr_longitude = location
+        home_distance = distance(
+            self.hass.config.latitude,
+            self.hass.config.longitude,
+            *location,
+        )
+        self._attr_distance = (
+            round(home_distance / 1000, 1)
+            if home_distance is not None
+            else None
+        )
+
+    @callback
+    def async_update_alert(self, alert: dict[str, Any]) -> None:
+        """Update the entity for a changed alert and write its state."""
+        self._apply_alert(alert)
+        if self.entity_id is not None:
+            self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the state attributes."""
+        alert = self.alert
+        attrs: dict[str, Any] = {
+            "alert_id": alert["id"],
+            "category": alert["category"],
+            "link": alert["link"],
+            "startDate": alert["startDate"],
+            "expirationDate": alert["expirationDate"],
+        }
+        if alert.get("severity") is not None:
+            attrs["severity"] = alert["severity"]
+        return attrs
@@ -0,0 +1,252 @@
+"""Alert geometry and spatial index for the BE Alert integration."""
+
+from __future__ import annotations
+
+from array import array
+import logging
+import math
+from typing import Any
+
+from .const import INDEX_CELL_SIZE, INDEX_MAX_CELLS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _shapely() -> Any:
+    """Import shapely on first use; it is slow to import at startup."""
+    # pylint: disable-next=import-outside-toplevel
+    import shapely.geometry  # noqa: F401
+    # pylint: disable-next=import-outside-toplevel
+    import shapely.errors  # noqa: F401
+
+    return shapely
+
+
+class AlertArea:
+    """A single alert polygon stored as a flat ``x, y`` coordinate array.
+
+    The shapely polygon is only built the first time a queried point
+    falls inside the bounding box of the area.
+    """
+
+    __slots__ = ("coords", "bbox", "_polygon", "_point")
+
+    def __init__(self, coords: array) -> None:
+        """Initialize the area from interleaved lon/lat coordinates."""
+        self.coords = coords
+        xs = coords[0::2]
+        ys = coords[1::2]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        # None: not built yet, False: building failed
+        self._polygon: Any = None
+        self._point: tuple[float, float] | None = None
+
+    def bbox_contains(self, lon: float, lat: float) -> bool:
+        """Return True if the point lies within the bounding box."""
+        min_x, min_y, max_x, max_y = self.bbox
+        return min_x <= lon <= max_x and min_y <= lat <= max_y
+
+    @property
+    def polygon(self) -> Any:
+        """Return the shapely polygon, building it on first access."""
+        if self._polygon is None:
+            shapely = _shapely()
+            coords = self.coords
+            points = list(zip(coords[0::2], coords[1::2]))
+            try:
+                self._polygon = shapely.geometry.Polygon(points)
+            except (shapely.errors.ShapelyError, ValueError):
+                _LOGGER.warning(
+                    "BeAlertFetcher: invalid polygon points, skipping",
+                    exc_info=True,
+                )
+                self._polygon = False
+        return self._polygon or None
+
+    def intersects_segment(
+        self, start: tuple[float, float], end: tuple[float, float]
+    ) -> bool:
+        """Return True if the line from start to end touches the polygon."""
+        min_x, min_y, max_x, max_y = self.bbox
+        if (
+            max(start[0], end[0]) < min_x
+            or min(start[0], end[0]) > max_x
+            or max(start[1], end[1]) < min_y
+            or min(start[1], end[1]) > max_y
+        ):
+            return False
+        polygon = self.polygon
+        if polygon is None:
+            return False
+        shapely = _shapely()
+        try:
+            return bool(
+                polygon.intersects(shapely.geometry.LineString([start, end]))
+            )
+        except (shapely.errors.ShapelyError, ValueError):
+            _LOGGER.warning(
+                "BeAlertFetcher: polygon intersects() failed",
+                exc_info=True,
+            )
+            return False
+
+    def representative_point(self) -> tuple[float, float]:
+        """Return a (lon, lat) point guaranteed to lie inside the area.
+
+        Builds the polygon, so it should run in the executor the first
+        time; the point is cached. An invalid polygon falls back to the
+        center of its bounding box.
+        """
+        if self._point is not None:
+            return self._point
+        min_x, min_y, max_x, max_y = self.bbox
+        result = (min_x + max_x) / 2, (min_y + max_y) / 2
+        if (polygon := self.polygon) is not None:
+            shapely = _shapely()
+            try:
+                point = polygon.representative_point()
+            except (shapely.errors.ShapelyError, ValueError):
+                _LOGGER.warning(
+                    "BeAlertFetcher: polygon representative_point() failed",
+                    exc_info=True,
+                )
+            else:
+                if not point.is_empty:
+                    result = point.x, point.y
+        self._point = result
+        return result
+
+    @property
+    def has_point(self) -> bool:
+        """Return True if the representative point is already known."""
+        return self._point is not None
+
+    def contains(self, lon: float, lat: float) -> bool:
+        """Return True if the point lies inside the polygon."""
+        if not self.bbox_contains(lon, lat):
+            return False
+        polygon = self.polygon
+        if polygon is None:
+            return False
+        shapely = _shapely()
+        try:
+            return bool(polygon.contains(shapely.geometry.Point(lon, lat)))
+        except (shapely.errors.ShapelyError, ValueError):
+            _LOGGER.warning(
+                "BeAlertFetcher: polygon contains() failed",
+                exc_info=True,
+            )
+            return False
+
+
+def _cell(value: float) -> int:
+    """Return the grid cell number for a coordinate."""
+    return math.floor(value / INDEX_CELL_SIZE)
+
+
+class AlertIndex:
+    """Uniform grid over the bounding boxes of all alert areas.
+
+    A point query only tests the areas registered in the grid cell that
+    contains the point, so matching cost does not grow with the number of
+    alerts elsewhere. Areas spanning more than ``INDEX_MAX_CELLS`` cells
+    are kept in a separate list that is always tested.
+    """
+
+    def __init__(self, alerts: list[dict]) -> None:
+        """Build the index for the given parsed alerts."""
+        self.alerts = alerts
+        self._cells: dict[tuple[int, int], list[tuple[int, AlertArea]]] = {}
+        self._large: list[tuple[int, AlertArea]] = []
+        for pos, alert in enumerate(alerts):
+            for area in alert["areas"]:
+                self._insert(pos, area)
+
+    def _insert(self, pos: int, area: AlertArea) -> None:
+        """Register an area in every grid cell its bounding box touches."""
+        min_x, min_y, max_x, max_y = area.bbox
+        x_range = range(_cell(min_x), _cell(max_x) + 1)
+        y_range = range(_cell(min_y), _cell(max_y) + 1)
+        if len(x_range) * len(y_range) > INDEX_MAX_CELLS:
+            self._large.append((pos, area))
+            return
+        for cx in x_range:
+            for cy in y_range:
+                self._cells.setdefault((cx, cy), []).append((pos, area))
+
+    def query_point(self, lon: float, lat: float) -> list[dict]:
+        """Return the alerts with an area containing the point."""
+        candidates = self._cells.get((_cell(lon), _cell(lat)), [])
+        matched: set[int] = set()
+        for pos, area in (*candidates, *self._large):
+            if pos not in matched and area.contains(lon, lat):
+                matched.add(pos)
+        return [self.alerts[pos] for pos in sorted(matched)]
+
+    def query_segment(
+        self, start: tuple[float, float], end: tuple[float, float]
+    ) -> list[dict]:
+        """Return the alerts with an area touched by a (lon, lat) segment.
+
+        Only the areas registered in the grid cells under the bounding box
+        of the segment are tested.
+        """
+        x_range = range(
+            _cell(min(start[0], end[0])), _cell(max(start[0], end[0])) + 1
+        )
+        y_range = range(
+            _cell(min(start[1], end[1])), _cell(max(start[1], end[1])) + 1
+        )
+        if len(x_range) * len(y_range) > INDEX_MAX_CELLS:
+            # Implausibly long jump, not worth scanning the whole grid
+            return []
+        tested: set[int] = set()
+        matched: set[int] = set()
+        cells = [
+            self._cells.get((cx, cy), []) for cx in x_range for cy in y_range
+        ]
+        for pos, area in (*(c for cell in cells for c in cell), *self._large):
+            if pos in matched or id(area) in tested:
+                continue
+            tested.add(id(area))
+            if area.intersects_segment(start, end):
+                matched.add(pos)
+        return [self.alerts[pos] for pos in sorted(matched)]
+
+    def query_points(
+        self, points: list[tuple[float, float]]
+    ) -> list[list[dict]]:
+        """Return the matching alerts for each of a batch of points.
+
+        Points are grouped per candidate area so every polygon is tested
+        with a single vectorized shapely call, which releases the GIL.
+        """
+        shapely = _shapely()
+        groups: dict[int, tuple[int, AlertArea, list[int]]] = {}
+        for i, (lon, lat) in enumerate(points):
+            candidates = self._cells.get((_cell(lon), _cell(lat)), [])
+            for pos, area in (*candidates, *self._large):
+                if area.bbox_contains(lon, lat):
+                    groups.setdefault(id(area), (pos, area, []))[2].append(i)
+
+        matched: list[set[int]] = [set() for _ in points]
+        for pos, area, indices in groups.values():
+            polygon = area.polygon
+            if polygon is None:
+                continue
+            try:
+                inside = shapely.contains_xy(
+                    polygon,
+                    [points[i][0] for i in indices],
+                    [points[i][1] for i in indices],
+                )
+            except (shapely.errors.ShapelyError, ValueError):
+                _LOGGER.warning(
+                    "BeAlertFetcher: polygon contains_xy() failed",
+                    exc_info=True,
+                )
+                continue
+            for i, hit in zip(indices, inside):
+                if hit:
+                    matched[i].add(pos)
+        return [[self.alerts[pos] for pos in sorted(m)] for m in matched]
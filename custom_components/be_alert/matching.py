@@ -0,0 +1,64 @@
+"""Batch matching of tracked locations for the BE Alert integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+import math
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .const import PARALLEL_MATCH_MIN_CHUNK, PARALLEL_MATCH_WORKERS
+from .data import BeAlertFetcher
+from .entity_helpers import _tracked_locations
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_match_locations(
+    hass: HomeAssistant,
+    fetcher: BeAlertFetcher,
+    configured_sensors: Iterable[dict[str, Any]],
+    parallel: bool,
+) -> None:
+    """Match all tracked locations and store them on the fetcher.
+
+    In parallel mode a large batch is split into chunks that are matched
+    in the executor thread pool; shapely's vectorized predicates release
+    the GIL, so chunks run on several cores without blocking the event
+    loop. The results are merged back on the loop, before the coordinator
+    notifies its entities. The fetcher must not be updated meanwhile, or
+    the matches would belong to older alerts; the coordinator update
+    holds a lock for that.
+    """
+    entity_ids, points = _tracked_locations(hass, configured_sensors)
+    match_points = fetcher.match_points_job()
+    workers = min(
+        PARALLEL_MATCH_WORKERS,
+        math.ceil(len(points) / PARALLEL_MATCH_MIN_CHUNK),
+    )
+    if not parallel or workers <= 1:
+        results = match_points(points)
+    else:
+        size = math.ceil(len(points) / workers)
+        chunks = await asyncio.gather(
+            *(
+                hass.async_add_executor_job(
+                    match_points, points[start:start + size]
+                )
+                for start in range(0, len(points), size)
+            )
+        )
+        results = [matches for chunk in chunks for matches in chunk]
+        _LOGGER.debug(
+            "BE Alert: matched %d locations in %d executor jobs",
+            len(points),
+            len(chunks),
+        )
+
+    fetcher.location_matches = {
+        entity_id: (point, matches)
+        for entity_id, point, matches in zip(entity_ids, points, results)
+    }
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import re
 from typing import TYPE_CHECKING
 
@@ -25,6 +25,19 @@ class BeAlertLocationSensorConfig:
     entry_id: str
 
 
+@dataclass
+class AlertDiff:
+    """Alerts that started, changed or ended in one feed generation."""
+
+    started: list[dict] = field(default_factory=list)
+    updated: list[dict] = field(default_factory=list)
+    ended: list[dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.started or self.updated or self.ended)
+
+
 def _slug(name: str) -> str:
     """Create a slug suitable for unique_id and entity_id suffix."""
     if not name:
@@ -4,9 +4,7 @@ import logging
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.helpers.entity_registry import (
-    async_get as async_get_entity_registry,
-)
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo, DeviceEntryType
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
@@ -15,10 +13,16 @@ from homeassistant.helpers.update_coordinator import (
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.const import CONF_ENTITY_ID
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import DOMAIN, LOCATION_SOURCE_DEVICE, LOCATION_SOURCE_ZONE
-from .entity_helpers import _create_location_entities
+from .entity_helpers import (
+    _alert_attributes,
+    _async_register_add_sensors,
+    _create_location_entities,
+    _get_coordinates,
+    _sensor_unique_ids,
+)
 from .data import BeAlertFetcher
 from .models import BeAlertLocationSensorConfig, _slug
 
@@ -31,24 +35,13 @@ async def _async_cleanup_stale_entities(
     configured_sensors: list[dict[str, Any]],
 ) -> None:
     """Remove stale entities from the registry for this entry."""
-    registry = async_get_entity_registry(hass)
-    desired_unique_ids = set()
-    for s in configured_sensors:
-        s_type = s.get("type")
-        if s_type == "all":
-            desired_unique_ids.add("be_alert_all")
-        elif s_type in (LOCATION_SOURCE_DEVICE, LOCATION_SOURCE_ZONE):
-            eid = s.get(CONF_ENTITY_ID)
-            if eid:
-                slug_eid = _slug(eid)
-                desired_unique_ids.add(f"be_alert_{slug_eid}")
-                # For binary sensor
-                desired_unique_ids.add(f"be_alert_{slug_eid}_alerting")
+    registry = er.async_get(hass)
+    desired_unique_ids: set[str] = set()
+    for sensor_config in configured_sensors:
+        desired_unique_ids |= _sensor_unique_ids(sensor_config)
 
     # Remove entities for this config entry that are no longer desired
-    for ent in list(registry.entities.values()):
-        if ent.config_entry_id != entry.entry_id:
-            continue
+    for ent in er.async_entries_for_config_entry(registry, entry.entry_id):
         if ent.domain not in ("sensor", "binary_sensor"):
             continue
         if ent.unique_id not in desired_unique_ids:
@@ -119,6 +112,14 @@ async def async_setup_entry(
             err,
         )
 
+    _async_register_add_sensors(
+        hass,
+        entry.entry_id,
+        "sensor",
+        _create_entities_from_config,
+        async_add_entities,
+    )
+
     entities_to_add = _create_entities_from_config(
         hass,
         entry.entry_id,
@@ -133,28 +134,26 @@ async def async_setup_entry(
             "entities.",
             len(entities_to_add),
         )
-        async_add_entities(entities_to_add, True)
+        async_add_entities(entities_to_add)
 
     else:
         _LOGGER.warning("sensor.async_setup_entry: No entities to add.")
 
 
-def _get_coordinates(hass: HomeAssistant, entity_id: str):
-    """Get lat and long for zone or device entity_id synchronously."""
-    if not entity_id:
-        return None
-    state = hass.states.get(entity_id)
-    if not state:
+def _restored_count(state: str | None) -> int | None:
+    """Convert a restored state string back to an alert count."""
+    try:
+        return int(state) if state is not None else None
+    except ValueError:
         return None
-    if "latitude" in state.attributes and "longitude" in state.attributes:
-        return state.attributes["latitude"], state.attributes["longitude"]
-    return None
 
 
 # ------------------- Global sensor (all alerts) -------------------
 
 
-class BeAlertAllSensor(CoordinatorEntity[DataUpdateCoordinator], SensorEntity):
+class BeAlertAllSensor(
+    CoordinatorEntity[DataUpdateCoordinator], SensorEntity, RestoreEntity
+):
     """Sensor showing total number of active alerts and full list."""
 
     _attr_has_entity_name = True
@@ -168,31 +167,36 @@ class BeAlertAllSensor(CoordinatorEntity[DataUpdateCoordinator], SensorEntity):
         super().__init__(coordinator)
         self._fetcher = fetcher
         self._attr_unique_id = "be_alert_all"
+        self._restored_state: str | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known count until the first fetch completes."""
+        await super().async_added_to_hass()
+        if not self._fetcher.has_data:
+            last_state = await self.async_get_last_state()
+            if last_state is not None:
+                self._restored_state = last_state.state
 
     @property
     def unique_id(self) -> str | None:
         return "be_alert_all"
 
     @property
-    def native_value(self) -> int:
+    def native_value(self) -> int | None:
+        if not self._fetcher.has_data:
+            return _restored_count(self._restored_state)
         return len(self._fetcher.alerts)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         attrs: dict[str, Any] = {
-            "alerts": [
-                {
-                    "title": a["title"],
-                    "link": a["link"],
-                    "category": a["category"],
-                    "pubDate": a["pubDate"],
-                    "startDate": a["startDate"],
-                    "expirationDate": a["expirationDate"],
-                    "description": a["description"],
-                }
-                for a in self._fetcher.alerts
-            ],
+            "alerts": [_alert_attributes(a) for a in self._fetcher.alerts],
             "last_checked": self._fetcher.last_checked,
+            "stale": self._fetcher.stale,
+            "feed_age": self._fetcher.feed_age,
+            "consecutive_failures": self._fetcher.consecutive_failures,
+            "total_failures": self._fetcher.total_failures,
+            "suppressed_writes": self._fetcher.suppressed_writes,
         }
         return attrs
 
@@ -200,7 +204,9 @@ class BeAlertAllSensor(CoordinatorEntity[DataUpdateCoordinator], SensorEntity):
 # ------------------- Per-location sensor (zone/device) -------------------
 
 
-class BeAlertLocationEntity(CoordinatorEntity[DataUpdateCoordinator]):
+class BeAlertLocationEntity(  # pylint: disable=too-many-instance-attributes
+    CoordinatorEntity[DataUpdateCoordinator], RestoreEntity
+):
     """Sensor showing number of alerts that affect the configured
     zone/device."""
 
@@ -230,43 +236,39 @@ class BeAlertLocationEntity(CoordinatorEntity[DataUpdateCoordinator]):
         )
 
         # These will be populated during the update
-        self._lat: float | None = None
-        self._lon: float | None = None  # pylint: disable=invalid-name
+        # Location as (lon, lat), like the fetcher's matches
+        self._point: tuple[float, float] | None = None
         self._matches: list[dict] = []
+        # State from before the restart, used until the first fetch
+        self._restored_state: str | None = None
+        # Everything the written state depends on, see _state_fingerprint
+        self._fingerprint: tuple | None = None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
         attrs: dict[str, Any] = {"source": self.config.source_entity_id}
         if self._matches:
-            attrs["alerts"] = [
-                {
-                    "title": a["title"],
-                    "link": a["link"],
-                    "category": a["category"],
-                    "pubDate": a["pubDate"],
-                    "startDate": a["startDate"],
-                    "expirationDate": a["expirationDate"],
-                    "description": a["description"],
-                }
-                for a in self._matches
-            ]
+            attrs["alerts"] = [_alert_attributes(a) for a in self._matches]
         return attrs
 
     @property
     def available(self) -> bool:
         """Entity availability depends on source entity having coordinates."""
-        return self._lat is not None and self._lon is not None
+        return self._point is not None
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
-        self._update_location()
-        self.async_on_remove(
-            self.coordinator.async_add_listener(
-                self._handle_coordinator_update
-            )
-        )
+        if not self.config.fetcher.has_data:
+            last_state = await self.async_get_last_state()
+            if last_state is not None:
+                self._restored_state = last_state.state
+        # Entities added through the options match the current alerts
+        # right away instead of waiting for the next refresh
+        self._update_matches()
+        # The state written when the entity is added
+        self._fingerprint = self._state_fingerprint()
 
     @callback
     def _update_location(self) -> None:
@@ -275,10 +277,10 @@ class BeAlertLocationEntity(CoordinatorEntity[DataUpdateCoordinator]):
             self.config.hass, self.config.source_entity_id
         )
         if coords:
-            self._lat, self._lon = coords
+            lat, lon = coords
+            self._point = (lon, lat)
         else:
-            self._lat = None
-            self._lon = None
+            self._point = None
             _LOGGER.debug(
                 "Could not get coordinates for %s, location sensor "
                 "unavailable.",
@@ -286,23 +288,51 @@ class BeAlertLocationEntity(CoordinatorEntity[DataUpdateCoordinator]):
             )
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        # First, get the most recent location
-        self._update_location()
-        # Then, find alerts for that location if source is available
-        if self.available:
-            self._matches = self.config.fetcher.alerts_affecting_point(
-                self._lon, self._lat
-            )
+    def _update_matches(self) -> None:
+        """Update the location and the alerts matching it."""
+        fetcher = self.config.fetcher
+        result = fetcher.location_matches.get(self.config.source_entity_id)
+        if result is not None:
+            # Use the batch matched by the coordinator for this refresh
+            self._point, self._matches = result
         else:
-            self._matches = []
+            # Get the most recent location and match it if available
+            self._update_location()
+            if self._point is not None:
+                self._matches = fetcher.alerts_affecting_point(*self._point)
+            else:
+                self._matches = []
         _LOGGER.debug(
             "BE Alert: %s found %d active alerts (available=%s)",
             self.name,
             len(self._matches),  # type: ignore[arg-type]
             self.available,
         )
+
+    def _state_fingerprint(self) -> tuple:
+        """Return a cheap summary of everything the state depends on."""
+        return (
+            self.available,
+            self.config.fetcher.has_data,
+            tuple(
+                (alert["id"], alert["pubDate"], alert.get("severity"))
+                for alert in self._matches
+            ),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator.
+
+        The state is only written when the matched alerts or availability
+        changed, so a stable feed causes no state machine traffic.
+        """
+        self._update_matches()
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._fingerprint:
+            self.config.fetcher.suppressed_writes += 1
+            return
+        self._fingerprint = fingerprint
         self.async_write_ha_state()
 
 
@@ -317,4 +347,6 @@ class BeAlertLocationSensor(BeAlertLocationEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the number of active alerts for the location."""
+        if not self.config.fetcher.has_data:
+            return _restored_count(self._restored_state)
         return len(self._matches)
@@ -0,0 +1,440 @@
+"""Alert feed sources for the BE Alert integration."""
+
+from __future__ import annotations
+
+import asyncio
+from array import array
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+import random
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.util import dt as ha_dt
+
+from .const import (
+    FEED_URL,
+    FETCH_BACKOFF_BASE,
+    FETCH_BACKOFF_MAX,
+    FETCH_RETRIES,
+    FETCH_TIMEOUT,
+    STREAM_CHUNK_SIZE,
+)
+from .geometry import AlertArea
+from .streaming import FeedItemStream
+
+_json_loads: Callable[[bytes], Any]
+try:
+    # Decode raw feed bodies with orjson, which ships with Home Assistant
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    _json_loads = json.loads
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    """Parse a feed timestamp into an aware UTC datetime."""
+    if not isinstance(value, str):
+        return None
+    parsed = ha_dt.parse_datetime(value)
+    return ha_dt.as_utc(parsed) if parsed is not None else None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Return a jittered exponential backoff delay for a retry attempt."""
+    return random.uniform(
+        0, min(FETCH_BACKOFF_MAX, FETCH_BACKOFF_BASE * 2**attempt)
+    )
+
+
+def _alert_id(item: dict[str, Any], areas: list[AlertArea]) -> str | None:
+    """Return the id used to deduplicate and track a feed item.
+
+    Items without identifier or link fall back to their title, which is
+    not unique: the same warning text can be issued for several areas. The
+    publication date and the extent of the areas are added so only true
+    duplicates share an id.
+    """
+    if alert_id := item.get("identifier") or item.get("link"):
+        return alert_id
+    if (title := item.get("title")) is None:
+        return None
+    extent = ""
+    if areas:
+        extent = ",".join(
+            f"{value:.4f}"
+            for value in (
+                min(area.bbox[0] for area in areas),
+                min(area.bbox[1] for area in areas),
+                max(area.bbox[2] for area in areas),
+                max(area.bbox[3] for area in areas),
+            )
+        )
+    return f"{title}|{item.get('pubDate') or ''}|{extent}"
+
+
+def _parse_alert_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Parse a single alert item from the feed into a structured dict."""
+    areas = []
+    for area in item.get("area", []):
+        for coordset in area.get("coordinates", []):
+            if coordset.get("type") == "LineString":
+                coords = array("d")
+                try:
+                    for p in coordset.get("coordinates", []):
+                        coords.append(p["x"])
+                        coords.append(p["y"])
+                except (KeyError, TypeError):
+                    _LOGGER.warning(
+                        "BeAlertFetcher: invalid polygon points, skipping",
+                        exc_info=True,
+                    )
+                    continue
+                if len(coords) >= 6:
+                    areas.append(AlertArea(coords))
+    return {
+        "id": _alert_id(item, areas),
+        "title": item.get("title"),
+        "link": item.get("link"),
+        "category": item.get("category"),
+        "pubDate": item.get("pubDate"),
+        "startDate": item.get("startDate"),
+        "expirationDate": item.get("expirationDate"),
+        "description": item.get("description"),
+        "expires": _parse_datetime(item.get("expirationDate")),
+        "areas": areas,
+    }
+
+
+def _parse_cap_polygon(value: str) -> AlertArea | None:
+    """Parse a CAP ``lat,lon lat,lon ...`` polygon into an alert area."""
+    coords = array("d")
+    for pair in value.split():
+        lat, lon = pair.split(",", 1)
+        coords.append(float(lon))
+        coords.append(float(lat))
+    return AlertArea(coords) if len(coords) >= 6 else None
+
+
+def _parse_cap_detail(alert: dict, data: Any) -> dict:
+    """Enrich a feed alert with the fields of its full CAP document.
+
+    Precise CAP polygons replace the coarse feed areas when present.
+    """
+    data = data.get("alert", data)
+    infos = data.get("info") or [{}]
+    info = infos[0] if isinstance(infos, list) else infos
+    areas = []
+    for area in info.get("area") or []:
+        polygons = area.get("polygon") or []
+        if isinstance(polygons, str):
+            polygons = [polygons]
+        for polygon in polygons:
+            if parsed := _parse_cap_polygon(polygon):
+                areas.append(parsed)
+    return {
+        **alert,
+        "severity": info.get("severity"),
+        "urgency": info.get("urgency"),
+        "certainty": info.get("certainty"),
+        "instruction": info.get("instruction"),
+        "areas": areas or alert["areas"],
+    }
+
+
+class BeAlertSource:  # pylint: disable=too-many-instance-attributes
+    """Base class for an alert feed fetched by the BE Alert fetcher.
+
+    Subclasses set ``name`` and ``url`` and implement ``parse``. Every
+    source keeps its own timeout, conditional-request state (ETag and
+    Last-Modified) and last good list of alerts, so one failing source
+    never affects the others.
+
+    Sources that set ``stream_key`` and implement ``parse_item`` can be
+    parsed while the body is downloaded: with ``streaming`` enabled the
+    items of the array under ``stream_key`` are turned into alerts one at
+    a time, so the full body and decoded document are never held.
+
+    A body identical to the last parsed one leaves the alerts untouched,
+    like a 304 response, so an unchanged feed keeps the same alert objects.
+
+    If ``body_listener`` is set it is called with the source, every raw
+    body received and the fetch duration in seconds.
+    """
+
+    name = "source"
+    url = ""
+    timeout: float = FETCH_TIMEOUT
+    stream_key: str | None = None
+    streaming = False
+    body_listener: Callable[[BeAlertSource, bytes, float], Any] | None = None
+
+    def __init__(self) -> None:
+        """Initialize the source state."""
+        self.alerts: list[dict] = []
+        self.has_data = False
+        self.last_success: datetime | None = None
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        # Hash of the body the current alerts were parsed from
+        self._body_hash: str | None = None
+
+    @property
+    def stale(self) -> bool:
+        """Return True if the last fetch failed and older data is kept."""
+        return self.has_data and self.consecutive_failures > 0
+
+    def _now(self) -> datetime:
+        """Return the time used for fetch bookkeeping and expiry."""
+        return ha_dt.utcnow()
+
+    def parse(self, data: Any) -> list[dict]:
+        """Parse a decoded feed body into alert dicts."""
+        raise NotImplementedError
+
+    def parse_item(self, item: Any) -> dict:
+        """Parse a single streamed item of ``stream_key`` into an alert."""
+        raise NotImplementedError
+
+    def _stream_parser(self, key: str) -> FeedItemStream:
+        """Return an incremental parser for one feed body."""
+        return FeedItemStream(key, self.parse_item)
+
+    def detail_url(self, _alert: dict) -> str | None:
+        """Return the URL of the full CAP document for an alert, if any."""
+        return None
+
+    def parse_detail(self, alert: dict, data: Any) -> dict:
+        """Return the alert enriched with its decoded CAP document."""
+        return _parse_cap_detail(alert, data)
+
+    async def async_fetch_detail(
+        self, session: aiohttp.ClientSession, alert: dict
+    ) -> dict | None:
+        """Fetch the full CAP document of an alert.
+
+        Return the enriched alert, or None if it could not be fetched.
+        """
+        if (url := self.detail_url(alert)) is None:
+            return None
+        try:
+            async with session.get(
+                url, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as resp:
+                resp.raise_for_status()
+                raw = await resp.read()
+            return self.parse_detail(alert, _json_loads(raw))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.warning(
+                "BeAlertSource %s: detail fetch for %s failed: %s",
+                self.name,
+                alert["id"],
+                err,
+            )
+        except (ValueError, AttributeError, TypeError) as err:
+            _LOGGER.warning(
+                "BeAlertSource %s: invalid detail document for %s: %s",
+                self.name,
+                alert["id"],
+                err,
+            )
+        return None
+
+    def _request_headers(self) -> dict[str, str]:
+        """Return the conditional request headers for the next fetch."""
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    async def _async_fetch_once(
+        self, session: aiohttp.ClientSession
+    ) -> bool:
+        """Fetch the feed once. Return True if new alerts were parsed."""
+        start = time.monotonic()
+        async with session.get(
+            self.url,
+            headers=self._request_headers(),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as resp:
+            if resp.status == 304 and self.has_data:
+                return False
+            resp.raise_for_status()
+            if self.streaming and self.stream_key is not None:
+                alerts, body_hash = await self._async_read_stream(
+                    resp, self.stream_key, start
+                )
+            else:
+                raw = await resp.read()
+                alerts = None
+                body_hash = hashlib.sha256(raw).hexdigest()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+        if alerts is None:
+            self._notify_body_listener(raw, start)
+        self._etag = etag
+        self._last_modified = last_modified
+        if self.has_data and body_hash == self._body_hash:
+            return False
+        if alerts is None:
+            self._store(raw)
+        else:
+            self._set_alerts(alerts)
+        self._body_hash = body_hash
+        return True
+
+    async def _async_read_stream(
+        self, resp: aiohttp.ClientResponse, key: str, start: float
+    ) -> tuple[list[dict], str]:
+        """Parse the response body chunk by chunk as it arrives.
+
+        Return the alerts and the hash of the body.
+        """
+        stream = self._stream_parser(key)
+        body_hash = hashlib.sha256()
+        # The raw body is only kept when it has to be recorded
+        chunks: list[bytes] | None = (
+            [] if self.body_listener is not None else None
+        )
+        alerts: list[dict] = []
+        async for chunk in resp.content.iter_chunked(STREAM_CHUNK_SIZE):
+            if chunks is not None:
+                chunks.append(chunk)
+            body_hash.update(chunk)
+            alerts.extend(stream.feed(chunk))
+        alerts.extend(stream.close())
+        if chunks is not None:
+            self._notify_body_listener(b"".join(chunks), start)
+        return alerts, body_hash.hexdigest()
+
+    def _notify_body_listener(self, raw: bytes, start: float) -> None:
+        """Pass a raw body and its fetch duration to the body listener."""
+        if self.body_listener is not None:
+            # Only declared as None on the class, set by the fetcher
+            # pylint: disable-next=not-callable
+            self.body_listener(self, raw, time.monotonic() - start)
+
+    def _store(self, raw: bytes) -> None:
+        """Parse a raw feed body into the alerts of this source."""
+        self._set_alerts(self.parse(_json_loads(raw)))
+
+    def _set_alerts(self, alerts: list[dict]) -> None:
+        """Replace the alerts of this source."""
+        for alert in alerts:
+            alert["source"] = self.name
+        self.alerts = alerts
+
+    async def async_fetch(self, session: aiohttp.ClientSession) -> bool:
+        """Fetch the feed, retrying with jittered backoff.
+
+        Return True if the alerts of this source changed. On failure the
+        previous alerts are kept and the failure counters are raised.
+        """
+        for attempt in range(FETCH_RETRIES):
+            if attempt:
+                delay = _backoff_delay(attempt - 1)
+                _LOGGER.debug(
+                    "BeAlertSource %s: retrying fetch in %.1f seconds",
+                    self.name,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+            try:
+                changed = await self._async_fetch_once(session)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                _LOGGER.warning(
+                    "BeAlertSource %s: fetch attempt %d/%d failed: %s",
+                    self.name,
+                    attempt + 1,
+                    FETCH_RETRIES,
+                    err,
+                )
+            except ValueError as err:
+                _LOGGER.warning(
+                    "BeAlertSource %s: invalid feed body on attempt "
+                    "%d/%d: %s",
+                    self.name,
+                    attempt + 1,
+                    FETCH_RETRIES,
+                    err,
+                )
+            else:
+                self.has_data = True
+                self.consecutive_failures = 0
+                self.last_success = self._now()
+                return changed
+
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        _LOGGER.error(
+            "BeAlertSource %s: fetch failed %d time(s) in a row, keeping "
+            "%d alerts from the last good feed",
+            self.name,
+            self.consecutive_failures,
+            len(self.alerts),
+        )
+        return False
+
+    def expire(self, max_staleness: timedelta) -> bool:
+        """Drop expired alerts, or all alerts once the feed is too old.
+
+        Return True if any alert was removed.
+        """
+        count = len(self.alerts)
+        now = self._now()
+        if (
+            self.stale
+            and self.last_success is not None
+            and now - self.last_success > max_staleness
+        ):
+            if self.alerts:
+                _LOGGER.warning(
+                    "BeAlertSource %s: feed stale for more than %s, "
+                    "clearing %d alerts",
+                    self.name,
+                    max_staleness,
+                    count,
+                )
+            self.alerts = []
+            # The next request has to be unconditional, and the same body
+            # parsed again, once the feed is back
+            self._etag = None
+            self._last_modified = None
+            self._body_hash = None
+        else:
+            self.alerts = [
+                alert
+                for alert in self.alerts
+                if alert["expires"] is None or alert["expires"] > now
+            ]
+        return len(self.alerts) != count
+
+
+class PublicAlertsBeSource(BeAlertSource):
+    """The publicalerts.be CAP gateway feed used by BE-Alert."""
+
+    name = "publicalerts.be"
+    url = FEED_URL
+    stream_key = "items"
+
+    def parse(self, data: Any) -> list[dict]:
+        """Parse the JSON feed of the CAP gateway."""
+        return [_parse_alert_item(item) for item in data.get("items", [])]
+
+    def parse_item(self, item: Any) -> dict:
+        """Parse a single item of the CAP gateway feed."""
+        return _parse_alert_item(item)
+
+    def detail_url(self, alert: dict) -> str | None:
+        """Return the CAP document linked from the feed item."""
+        return alert.get("link")
@@ -0,0 +1,179 @@
+"""Incremental JSON feed parsing for the BE Alert integration."""
+
+from __future__ import annotations
+
+import codecs
+from collections.abc import Callable
+import json
+import re
+from typing import Any, ClassVar
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+# Stateless, shared by all streams
+_DECODER = json.JSONDecoder()
+
+# Scanner states
+_START, _KEY, _COLON, _VALUE, _AFTER_VALUE = range(5)
+_ITEM, _AFTER_ITEM, _DONE = range(5, 8)
+
+
+class FeedItemStream:
+    """Yield the items of one array in a JSON object as chunks arrive.
+
+    Only the array stored under ``key`` in the top-level object is
+    streamed. Every item is decoded with the stdlib C scanner and passed
+    through ``parse_item`` as soon as it is complete, so the raw body and
+    the full decoded document never have to be held in memory at once:
+    the buffer only keeps the unparsed rest of the last chunk. Other
+    values of the top-level object are decoded and dropped.
+    """
+
+    def __init__(
+        self, key: str, parse_item: Callable[[Any], Any] = lambda item: item
+    ) -> None:
+        """Initialize the stream."""
+        self._key = key
+        self._parse_item = parse_item
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._state = _START
+        self._current_key: str | None = None
+        self._closed = False
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        """Consume a chunk and return the items completed by it."""
+        self._text += self._utf8.decode(chunk)
+        return self._scan()
+
+    def close(self) -> list[Any]:
+        """Finish the body and return the last items.
+
+        Raise ValueError if the body was not a complete JSON object.
+        """
+        self._text += self._utf8.decode(b"", final=True)
+        self._closed = True
+        items = self._scan()
+        if self._state != _DONE or self._text.strip():
+            raise ValueError("Truncated or invalid feed body")
+        return items
+
+    def _decode(self, pos: int) -> tuple[Any, int] | None:
+        """Decode the value at pos, or return None if it is incomplete."""
+        text = self._text
+        try:
+            value, end = _DECODER.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # The value may be cut off by the end of the chunk; a body that
+            # is really invalid fails once it is complete
+            if not self._closed:
+                return None
+            raise
+        if not self._closed and (
+            end == len(text)
+            or (isinstance(value, (int, float)) and text[end] in "+-.eE")
+        ):
+            # A number cut off by the end of the chunk decodes as a valid
+            # shorter number; wait for the rest of it
+            return None
+        return value, end
+
+    def _scan(self) -> list[Any]:
+        """Advance the scanner as far as the buffered text allows."""
+        items: list[Any] = []
+        text = self._text
+        pos = 0
+        while self._state != _DONE:
+            if (match := _NON_WHITESPACE.search(text, pos)) is None:
+                # Only whitespace left
+                pos = len(text)
+                break
+            pos = match.start()
+            handler = self._handlers[self._state]
+            if (end := handler(self, text[pos], pos, items)) is None:
+                # The value at pos is incomplete; wait for the next chunk
+                break
+            pos = end
+        self._text = text[pos:]
+        return items
+
+    def _expect(self, char: str, expected: str, state: int, pos: int) -> int:
+        """Consume a required character and switch to the next state."""
+        if char != expected:
+            raise ValueError(f"Unexpected {char!r} in feed body")
+        self._state = state
+        return pos + 1
+
+    def _separator(
+        self, char: str, pos: int, closing: str, inside: int, outside: int
+    ) -> int:
+        """Consume the comma or closing bracket after a value."""
+        if char == closing:
+            self._state = outside
+            return pos + 1
+        return self._expect(char, ",", inside, pos)
+
+    def _scan_start(self, char: str, pos: int, _items: list) -> int:
+        """Handle the opening brace of the top-level object."""
+        if char != "{":
+            raise ValueError("Feed body is not a JSON object")
+        self._state = _KEY
+        return pos + 1
+
+    def _scan_key(self, char: str, pos: int, _items: list) -> int | None:
+        """Handle a member name, or the end of the object."""
+        if char == "}":
+            self._state = _DONE
+            return pos + 1
+        if (decoded := self._decode(pos)) is None:
+            return None
+        self._current_key, end = decoded
+        self._state = _COLON
+        return end
+
+    def _scan_colon(self, char: str, pos: int, _items: list) -> int:
+        """Handle the colon after a member name."""
+        return self._expect(char, ":", _VALUE, pos)
+
+    def _scan_value(self, char: str, pos: int, _items: list) -> int | None:
+        """Enter the streamed array, or decode and drop another value."""
+        if char == "[" and self._current_key == self._key:
+            self._state = _ITEM
+            return pos + 1
+        if (decoded := self._decode(pos)) is None:
+            return None
+        self._state = _AFTER_VALUE
+        return decoded[1]
+
+    def _scan_after_value(self, char: str, pos: int, _items: list) -> int:
+        """Handle the separator after a member value."""
+        return self._separator(char, pos, "}", _KEY, _DONE)
+
+    def _scan_item(self, char: str, pos: int, items: list) -> int | None:
+        """Decode and parse an array item, or leave an empty array."""
+        if char == "]":
+            self._state = _AFTER_VALUE
+            return pos + 1
+        if (decoded := self._decode(pos)) is None:
+            return None
+        item, end = decoded
+        items.append(self._parse_item(item))
+        self._state = _AFTER_ITEM
+        return end
+
+    def _scan_after_item(self, char: str, pos: int, _items: list) -> int:
+        """Handle the separator after an array item."""
+        return self._separator(char, pos, "]", _ITEM, _AFTER_VALUE)
+
+    # Scanner state -> handler of the next non-whitespace character
+    _handlers: ClassVar[
+        dict[int, Callable[[FeedItemStream, str, int, list], int | None]]
+    ] = {
+        _START: _scan_start,
+        _KEY: _scan_key,
+        _COLON: _scan_colon,
+        _VALUE: _scan_value,
+        _AFTER_VALUE: _scan_after_value,
+        _ITEM: _scan_item,
+        _AFTER_ITEM: _scan_after_item,
+    }
@@ -0,0 +1,113 @@
+"""Path-based alert crossing detection for the BE Alert integration."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+import logging
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+
+from .const import EVENT_ALERT_CROSSED, PATH_HISTORY_SIZE
+from .data import BeAlertFetcher
+from .events import _event_data
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _state_position(state: State | None) -> tuple[float, float] | None:
+    """Return the (lon, lat) position of a state, if it has one."""
+    if state is None:
+        return None
+    lat = state.attributes.get("latitude")
+    lon = state.attributes.get("longitude")
+    if lat is None or lon is None:
+        return None
+    return lon, lat
+
+
+class BeAlertPathTracker:
+    """Detect alert areas crossed between two position updates.
+
+    A fast tracker can jump over a small alert area between two GPS
+    updates, so point matching never sees it. Every position update of a
+    tracked entity tests the travelled segment against the alert index
+    and fires ``be_alert_crossed`` for areas it passed through. A short
+    history of positions and the alerts crossed along them is kept per
+    entity, so GPS jitter around an area does not repeat the event.
+    """
+
+    def __init__(self, hass: HomeAssistant, fetcher: BeAlertFetcher) -> None:
+        """Initialize the path tracker."""
+        self._hass = hass
+        self._fetcher = fetcher
+        self._paths: dict[str, deque[tuple[float, float]]] = {}
+        # Alert ids crossed on the segment ending at each path position
+        self._crossed: dict[str, deque[frozenset[str]]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_track(self, entity_ids: Iterable[str]) -> None:
+        """Follow the position updates of the given entities."""
+        self.async_stop()
+        tracked = set(entity_ids)
+        for entity_id in self._paths.keys() - tracked:
+            del self._paths[entity_id]
+            del self._crossed[entity_id]
+        if tracked:
+            self._unsub = async_track_state_change_event(
+                self._hass, sorted(tracked), self._async_handle_state_change
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following position updates."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_handle_state_change(self, event: Event) -> None:
+        """Test the segment travelled since the previous position."""
+        entity_id = event.data["entity_id"]
+        if (position := _state_position(event.data["new_state"])) is None:
+            return
+        if (path := self._paths.get(entity_id)) is None:
+            path = self._paths[entity_id] = deque(maxlen=PATH_HISTORY_SIZE)
+            crossed = self._crossed[entity_id] = deque(
+                maxlen=PATH_HISTORY_SIZE
+            )
+            if old := _state_position(event.data["old_state"]):
+                path.append(old)
+                crossed.append(frozenset())
+        else:
+            crossed = self._crossed[entity_id]
+        if path and path[-1] == position:
+            return
+
+        alerts = (
+            self._fetcher.alerts_crossed(path[-1], position) if path else []
+        )
+        reported = frozenset().union(*crossed)
+        path.append(position)
+        crossed.append(
+            frozenset(a["id"] for a in alerts if a["id"] is not None)
+        )
+        for alert in alerts:
+            if alert["id"] in reported:
+                continue
+            _LOGGER.debug(
+                "BeAlertPathTracker: %s crossed alert %s",
+                entity_id,
+                alert["id"],
+            )
+            self._hass.bus.async_fire(
+                EVENT_ALERT_CROSSED, _event_data(alert, [entity_id], "path")
+            )
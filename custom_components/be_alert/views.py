@@ -0,0 +1,209 @@
+"""GeoJSON HTTP endpoint for the BE Alert integration."""
+
+from __future__ import annotations
+
+import gzip
+from http import HTTPStatus
+import logging
+from typing import Any
+import zlib
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+
+from .const import (
+    DOMAIN,
+    GEOJSON_CACHE_SIZE,
+    GEOJSON_LOD_MIN_ZOOM,
+    GEOJSON_LOD_TOLERANCES,
+)
+from .data import BeAlertFetcher
+from .entity_helpers import _alert_attributes
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE_GEOJSON = "application/geo+json"
+
+BBox = tuple[float, float, float, float]
+
+
+def _lod_for_zoom(zoom: int | None) -> int:
+    """Return the level of detail to serve for a map zoom level."""
+    if zoom is None:
+        return len(GEOJSON_LOD_TOLERANCES) - 1
+    lod = 0
+    for level, min_zoom in enumerate(GEOJSON_LOD_MIN_ZOOM):
+        if zoom >= min_zoom:
+            lod = level
+    return lod
+
+
+def _parse_bbox(value: str | None) -> BBox | None:
+    """Parse a ``min_lon,min_lat,max_lon,max_lat`` query parameter."""
+    if value is None:
+        return None
+    parts = [float(part) for part in value.split(",")]
+    if len(parts) != 4 or parts[0] > parts[2] or parts[1] > parts[3]:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+def _bbox_intersects(a: BBox, b: BBox) -> bool:
+    """Return True if two bounding boxes overlap."""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _alert_feature(
+    alert: dict[str, Any], tolerance: float
+) -> tuple[BBox, dict[str, Any]] | None:
+    """Return the bounding box and GeoJSON feature of an alert."""
+    polygons = []
+    for area in alert["areas"]:
+        polygon = area.polygon
+        if polygon is None:
+            continue
+        if tolerance:
+            polygon = polygon.simplify(tolerance, preserve_topology=True)
+        if polygon.is_empty:
+            continue
+        polygons.append([list(polygon.exterior.coords)])
+    if not polygons:
+        return None
+    areas = alert["areas"]
+    bbox = (
+        min(area.bbox[0] for area in areas),
+        min(area.bbox[1] for area in areas),
+        max(area.bbox[2] for area in areas),
+        max(area.bbox[3] for area in areas),
+    )
+    feature = {
+        "type": "Feature",
+        "id": alert["id"],
+        "bbox": list(bbox),
+        "geometry": {"type": "MultiPolygon", "coordinates": polygons},
+        "properties": _alert_attributes(alert),
+    }
+    return bbox, feature
+
+
+class BeAlertGeoJsonView(HomeAssistantView):
+    """Serve the current alerts as a GeoJSON feature collection.
+
+    Query parameters: ``zoom`` selects a pre-simplified level of detail and
+    ``bbox`` (``min_lon,min_lat,max_lon,max_lat``) limits the features.
+    Features are built once per level of detail and feed generation, and
+    serialized responses are cached with their ETag and gzip body, so a
+    repeated poll is answered with a header comparison.
+    """
+
+    url = "/api/be_alert/geojson"
+    name = "api:be_alert:geojson"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self._hass = hass
+        self._generation: str | None = None
+        self._features: dict[int, list[tuple[BBox, dict[str, Any]]]] = {}
+        self._responses: dict[tuple, tuple[bytes, bytes]] = {}
+
+    def _fetcher(self) -> BeAlertFetcher | None:
+        """Return the fetcher of the configured entry, if any."""
+        for entry_data in self._hass.data.get(DOMAIN, {}).values():
+            return entry_data["fetcher"]
+        return None
+
+    @staticmethod
+    def _build(
+        alerts: list[dict],
+        features_by_lod: dict[int, list[tuple[BBox, dict[str, Any]]]],
+        lod: int,
+        bbox: BBox | None,
+    ) -> tuple[bytes, bytes]:
+        """Serialize (and gzip) a feature collection. Runs in executor."""
+        if (features := features_by_lod.get(lod)) is None:
+            tolerance = GEOJSON_LOD_TOLERANCES[lod]
+            features = [
+                feature
+                for alert in alerts
+                if (feature := _alert_feature(alert, tolerance)) is not None
+            ]
+            features_by_lod[lod] = features
+        body = json_bytes(
+            {
+                "type": "FeatureCollection",
+                "features": [
+                    feature
+                    for feature_bbox, feature in features
+                    if bbox is None or _bbox_intersects(feature_bbox, bbox)
+                ],
+            }
+        )
+        return body, gzip.compress(body, compresslevel=6)
+
+    async def _async_bodies(
+        self,
+        fetcher: BeAlertFetcher,
+        generation: str,
+        lod: int,
+        bbox: BBox | None,
+    ) -> tuple[bytes, bytes]:
+        """Return the plain and gzipped body, from the cache if possible."""
+        key = (lod, bbox)
+        if (cached := self._responses.get(key)) is None:
+            cached = await self._hass.async_add_executor_job(
+                self._build, fetcher.alerts, self._features, lod, bbox
+            )
+            # Only cache if the feed did not change while building
+            if generation == self._generation:
+                if len(self._responses) >= GEOJSON_CACHE_SIZE:
+                    del self._responses[next(iter(self._responses))]
+                self._responses[key] = cached
+        return cached
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the alerts as GeoJSON."""
+        fetcher = self._fetcher()
+        if fetcher is None:
+            return self.json_message(
+                "BE Alert is not set up", HTTPStatus.NOT_FOUND
+            )
+        try:
+            zoom = request.query.get("zoom")
+            lod = _lod_for_zoom(int(zoom) if zoom is not None else None)
+            bbox = _parse_bbox(request.query.get("bbox"))
+        except ValueError as err:
+            return self.json_message(str(err), HTTPStatus.BAD_REQUEST)
+
+        generation = f"{id(fetcher):x}-{fetcher.generation}"
+        if generation != self._generation:
+            self._generation = generation
+            self._features = {}
+            self._responses = {}
+
+        use_gzip = "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        bbox_hash = zlib.crc32(repr(bbox).encode())
+        encoding = "-gzip" if use_gzip else ""
+        etag = f'"{generation}-{lod}-{bbox_hash:x}{encoding}"'
+        headers: dict[str, str] = {
+            hdrs.CACHE_CONTROL: "no-cache",
+            hdrs.ETAG: etag,
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(
+                status=HTTPStatus.NOT_MODIFIED, headers=headers
+            )
+
+        body, gzipped = await self._async_bodies(
+            fetcher, generation, lod, bbox
+        )
+        if use_gzip:
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+            body = gzipped
+        return web.Response(
+            body=body, content_type=CONTENT_TYPE_GEOJSON, headers=headers
+        )
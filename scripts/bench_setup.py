@@ -0,0 +1,205 @@
+"""Import and setup benchmark for the BE Alert integration.
+
+Measures the two costs that delay Home Assistant startup:
+
+* importing the package in a fresh interpreter, with the Home Assistant
+  modules it depends on already loaded, next to the cost of importing
+  shapely, which the package only loads once a polygon is needed;
+* setting up a config entry in a real Home Assistant instance (see
+  ``soak_test.py``) against a slow local feed: the time until
+  ``async_setup_entry`` returned, and the time until the first refresh,
+  which runs in the background, had data.
+
+A setup that waited for the first refresh would take at least the first
+refresh time; the difference is the startup delay that is avoided.
+
+Usage::
+
+    python scripts/bench_setup.py --feed-delay 2 --trackers 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import ExitStack
+import json
+import logging
+from pathlib import Path
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from aiohttp import web
+
+from homeassistant.config_entries import ConfigEntry
+
+from soak_test import (
+    DOMAIN,
+    SyntheticFeed,
+    _async_set_tracker,
+    _async_setup_hass,
+    _async_start_feed,
+    _tracker_states,
+    async_wait_first_refresh,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Home Assistant modules imported by the package, loaded before timing so
+# only the integration itself is measured
+HA_MODULES = (
+    "aiohttp",
+    "homeassistant.components.http",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.event",
+    "homeassistant.helpers.json",
+    "homeassistant.helpers.update_coordinator",
+)
+
+IMPORT_SNIPPET = """
+import importlib, json, logging, sys, time
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, {root!r})
+for name in {preload!r}:
+    importlib.import_module(name)
+start = time.perf_counter()
+importlib.import_module({module!r})
+print(json.dumps({{
+    "seconds": time.perf_counter() - start,
+    "shapely": "shapely" in sys.modules,
+}}))
+"""
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Fresh interpreters per import"
+    )
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument("--trackers", type=int, default=50)
+    parser.add_argument(
+        "--feed-delay",
+        type=float,
+        default=2,
+        help="Seconds the local feed waits before answering",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
+def _time_import(module: str, preload: tuple[str, ...], runs: int) -> dict:
+    """Import a module in fresh interpreters and return the median time."""
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                IMPORT_SNIPPET.format(
+                    root=str(REPO_ROOT), preload=preload, module=module
+                ),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+    return {
+        "seconds": statistics.median(r["seconds"] for r in results),
+        "shapely": any(r["shapely"] for r in results),
+    }
+
+
+class SlowFeed(SyntheticFeed):
+    """Synthetic feed that answers after a fixed delay."""
+
+    def __init__(self, rng: random.Random, count: int, delay: float):
+        """Initialize the feed."""
+        super().__init__(rng, count, churn=0)
+        self._delay = delay
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Serve the feed after the delay."""
+        await asyncio.sleep(self._delay)
+        return await super().handle(request)
+
+
+async def async_time_setup(args: argparse.Namespace) -> tuple[float, float]:
+    """Return the setup and first refresh times of a config entry."""
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.be_alert import sources
+
+    rng = random.Random(args.seed)
+    feed = SlowFeed(rng, args.alerts, args.feed_delay)
+    feed_runner, feed_url = await _async_start_feed(feed)
+    sources.PublicAlertsBeSource.url = feed_url
+
+    with ExitStack() as stack:
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        hass = await _async_setup_hass(Path(tmp))
+        positions = _tracker_states(rng, args.trackers)
+        for entity_id, (lat, lon) in positions.items():
+            _async_set_tracker(hass, entity_id, lat, lon)
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="BE Alert",
+            data={},
+            source="user",
+            options={
+                "sensors": [{"type": "all"}]
+                + [
+                    {"type": "device", "entity_id": entity_id}
+                    for entity_id in positions
+                ]
+            },
+        )
+        start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - start
+        await async_wait_first_refresh(hass, entry.entry_id)
+        first_refresh_time = time.perf_counter() - start
+        await hass.async_stop()
+    await feed_runner.cleanup()
+    return setup_time, first_refresh_time
+
+
+def main() -> int:
+    """Run the benchmark."""
+    args = _parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    sys.path.insert(0, str(REPO_ROOT))
+
+    package = _time_import("custom_components.be_alert", HA_MODULES, args.runs)
+    shapely = _time_import("shapely.geometry", (), args.runs)
+    print(
+        f"import be_alert:       {package['seconds'] * 1000:.1f} ms "
+        f"(shapely loaded: {'yes' if package['shapely'] else 'no'})"
+    )
+    print(f"import shapely:        {shapely['seconds'] * 1000:.1f} ms")
+
+    setup_time, first_refresh_time = asyncio.run(async_time_setup(args))
+    print(f"async_setup_entry:     {setup_time * 1000:.0f} ms")
+    print(
+        f"first refresh done:    {first_refresh_time * 1000:.0f} ms "
+        f"(feed delay {args.feed_delay:g} s)"
+    )
+    print(
+        "setup not spent waiting for the feed: "
+        f"{(first_refresh_time - setup_time) * 1000:.0f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Replay a recorded BE Alert feed archive through the fetcher.
+
+Reads the bodies recorded with the ``record_feed`` option (by default
+from ``<config>/be_alert_archive``) and feeds them, in order, through the
+real ``BeAlertFetcher`` without any network access. With ``--speed 1``
+the original fetch durations and the gaps between fetches are kept,
+larger values replay faster and ``0`` replays as fast as possible.
+
+Every step prints the parse time, the peak memory allocated while
+parsing (measured with ``tracemalloc``), the number of alerts and the
+started, updated and ended alerts, followed by a summary. Because expiry
+uses the recorded fetch times, the output is the same on every run. Pass
+``--streaming`` to parse the bodies incrementally, like the
+``streaming_parse`` option does.
+
+Usage::
+
+    python scripts/replay_feed.py /config/be_alert_archive --points 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Rough bounding box of Belgium (lon/lat)
+MIN_LON, MIN_LAT, MAX_LON, MAX_LAT = 2.5, 49.5, 6.4, 51.5
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("archive", type=Path, help="Archive directory")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="Replay speed factor, 0 replays without delays",
+    )
+    parser.add_argument(
+        "--points",
+        type=int,
+        default=0,
+        help="Random tracked locations matched after every step",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Parse bodies incrementally instead of all at once",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--quiet", action="store_true")
+    return parser.parse_args()
+
+
+async def async_run(args: argparse.Namespace) -> int:
+    """Replay the archive and print the results."""
+    # pylint: disable=import-outside-toplevel
+    from custom_components.be_alert.archive import FeedArchive, ReplaySource
+    from custom_components.be_alert.data import BeAlertFetcher
+    from custom_components.be_alert.sources import PublicAlertsBeSource
+
+    archive = FeedArchive(args.archive, max_bytes=0)
+    source = ReplaySource(archive, PublicAlertsBeSource(), args.speed)
+    if not source.remaining:
+        print(f"No recorded feed bodies in {args.archive}")
+        return 1
+    fetcher = BeAlertFetcher(None, sources=[source], streaming=args.streaming)
+    rng = random.Random(args.seed)
+    points = [
+        (rng.uniform(MIN_LON, MAX_LON), rng.uniform(MIN_LAT, MAX_LAT))
+        for _ in range(args.points)
+    ]
+
+    update_times: list[float] = []
+    peaks: list[float] = []
+    match_times: list[float] = []
+    previous = None
+    while source.remaining:
+        entry = source.upcoming
+        if args.speed and previous is not None and entry is not None:
+            gap = (entry.fetched_at - previous.fetched_at).total_seconds()
+            await asyncio.sleep(max(0, gap - entry.duration) / args.speed)
+        tracemalloc.start()
+        start = time.perf_counter()
+        await fetcher.async_update()
+        update_times.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 2**20)
+        tracemalloc.stop()
+        start = time.perf_counter()
+        matched = sum(map(len, fetcher.match_points_job()(points)))
+        match_times.append(time.perf_counter() - start)
+        previous = source.current
+        if not args.quiet:
+            diff = fetcher.diff
+            print(
+                f"{previous.fetched_at.isoformat()}  "
+                f"{update_times[-1] * 1000:8.1f} ms  "
+                f"{peaks[-1]:6.1f} MiB  "
+                f"{len(fetcher.alerts):4d} alerts  "
+                f"+{len(diff.started)} ~{len(diff.updated)} "
+                f"-{len(diff.ended)}  {matched} matches"
+            )
+
+    print(
+        f"{len(update_times)} bodies replayed, update "
+        f"median {statistics.median(update_times) * 1000:.1f} ms, "
+        f"max {max(update_times) * 1000:.1f} ms, "
+        f"peak memory {max(peaks):.1f} MiB"
+    )
+    if points:
+        print(
+            f"matching {len(points)} points: "
+            f"median {statistics.median(match_times) * 1000:.1f} ms, "
+            f"max {max(match_times) * 1000:.1f} ms"
+        )
+    return 0
+
+
+def main() -> int:
+    """Run the replay."""
+    args = _parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    sys.path.insert(0, str(REPO_ROOT))
+    return asyncio.run(async_run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
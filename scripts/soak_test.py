@@ -0,0 +1,487 @@
+"""Soak test for the BE Alert integration with a large tracker fleet.
+
+Boots a real Home Assistant instance in a temporary config directory with
+this repository's ``custom_components/be_alert`` linked in, serves a busy
+synthetic feed from a local aiohttp server and tracks a fleet of
+``device_tracker`` entities that keep moving. The real config entry setup,
+coordinator refreshes and entity updates run for the requested duration.
+
+At the end it reports event-loop lag percentiles, memory growth and state
+writes, and exits with status 1 when one of the budgets is exceeded or
+anything was logged at ERROR level, which includes exceptions in
+coordinator listeners and unretrieved task exceptions.
+
+Usage::
+
+    python scripts/soak_test.py --trackers 500 --alerts 300 --duration 120
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from contextlib import ExitStack
+from datetime import timedelta
+import gc
+import logging
+import os
+from pathlib import Path
+import random
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+from unittest.mock import patch
+
+from aiohttp import web
+
+from homeassistant import auth, bootstrap, loader
+from homeassistant.config_entries import ConfigEntries, ConfigEntry
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, StateMachine, callback
+from homeassistant.setup import async_setup_component
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOMAIN = "be_alert"
+
+# Rough bounding box of Belgium (lon/lat)
+MIN_LON, MIN_LAT, MAX_LON, MAX_LAT = 2.5, 49.5, 6.4, 51.5
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--trackers", type=int, default=300)
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument(
+        "--duration", type=float, default=60, help="Seconds to run"
+    )
+    parser.add_argument(
+        "--refresh-interval",
+        type=float,
+        default=5,
+        help="Seconds between coordinator refreshes",
+    )
+    parser.add_argument(
+        "--move-rate",
+        type=float,
+        default=50,
+        help="Tracker position updates per second over the whole fleet",
+    )
+    parser.add_argument(
+        "--churn",
+        type=float,
+        default=0.05,
+        help="Fraction of alerts replaced on every feed request",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-lag-p99-ms", type=float, default=100)
+    parser.add_argument("--max-lag-ms", type=float, default=500)
+    parser.add_argument("--max-memory-growth-mb", type=float, default=64)
+    parser.add_argument(
+        "--max-writes-per-refresh",
+        type=float,
+        default=None,
+        help="Budget for BE Alert state writes per refresh "
+        "(default: 2 per tracker + alerts)",
+    )
+    return parser.parse_args()
+
+
+def _free_port() -> int:
+    """Return a free local TCP port for the Home Assistant HTTP server."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_mb() -> float:
+    """Return the resident set size of this process in MiB."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # Peak instead of current RSS, in KiB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SyntheticFeed:
+    """Busy feed of random square alert areas over Belgium."""
+
+    def __init__(self, rng: random.Random, count: int, churn: float):
+        """Initialize the feed."""
+        self._rng = rng
+        self._churn = churn
+        self._serial = 0
+        self.requests = 0
+        self.items = [self._item() for _ in range(count)]
+
+    def _item(self) -> dict[str, Any]:
+        """Return a random alert item in the CapGateway format."""
+        self._serial += 1
+        size = self._rng.uniform(0.01, 0.4)
+        lon = self._rng.uniform(MIN_LON, MAX_LON - size)
+        lat = self._rng.uniform(MIN_LAT, MAX_LAT - size)
+        ring = [
+            {"x": lon, "y": lat},
+            {"x": lon + size, "y": lat},
+            {"x": lon + size, "y": lat + size},
+            {"x": lon, "y": lat + size},
+            {"x": lon, "y": lat},
+        ]
+        return {
+            "identifier": f"soak-{self._serial}",
+            "title": f"Soak alert {self._serial}",
+            "link": None,
+            "category": "Met",
+            "pubDate": "2024-01-01T00:00:00+01:00",
+            "startDate": "2024-01-01T00:00:00+01:00",
+            "expirationDate": "2099-01-01T00:00:00+01:00",
+            "description": "Synthetic alert for the soak test",
+            "area": [{"coordinates": [{"type": "LineString",
+                                       "coordinates": ring}]}],
+        }
+
+    async def handle(self, _request: web.Request) -> web.Response:
+        """Serve the feed, replacing a fraction of the alerts each time."""
+        self.requests += 1
+        for _ in range(int(len(self.items) * self._churn)):
+            self.items[self._rng.randrange(len(self.items))] = self._item()
+        return web.json_response({"items": self.items})
+
+
+class ErrorCounter(logging.Handler):
+    """Count log records at ERROR level or above.
+
+    Unretrieved task exceptions end up here too: asyncio reports them
+    through its default exception handler, which logs them as errors.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        super().__init__(logging.ERROR)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Remember the record."""
+        self.records.append(record)
+
+
+class LagMonitor:
+    """Sample event-loop lag by measuring oversleep of a short timer."""
+
+    def __init__(self, interval: float = 0.05):
+        """Initialize the monitor."""
+        self._interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    async def _run(self) -> None:
+        """Record how late every wake-up is, in milliseconds."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            self.samples.append(
+                (loop.time() - start - self._interval) * 1000
+            )
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+
+    def percentile(self, pct: float) -> float:
+        """Return a lag percentile in milliseconds."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
+async def _async_start_feed(feed: SyntheticFeed) -> tuple[web.AppRunner, str]:
+    """Start the local stand-in for the feed server."""
+    app = web.Application()
+    app.router.add_get("/CapGateway/feed", feed.handle)
+    app_runner = web.AppRunner(app)
+    await app_runner.setup()
+    site = web.TCPSite(app_runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return app_runner, f"http://127.0.0.1:{port}/CapGateway/feed"
+
+
+async def _async_setup_hass(config_dir: Path) -> HomeAssistant:
+    """Boot Home Assistant with only what the integration needs."""
+    (config_dir / "custom_components").mkdir()
+    (config_dir / "custom_components" / DOMAIN).symlink_to(
+        REPO_ROOT / "custom_components" / DOMAIN
+    )
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    hass.config.latitude = 50.85
+    hass.config.longitude = 4.35
+    loader.async_setup(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    hass.auth = await auth.auth_manager_from_config(hass, [], [])
+    for domain, config in (
+        ("homeassistant", {}),
+        (
+            "http",
+            {
+                "http": {
+                    "server_host": "127.0.0.1",
+                    "server_port": _free_port(),
+                }
+            },
+        ),
+    ):
+        if not await async_setup_component(hass, domain, config):
+            raise RuntimeError(f"Failed to set up {domain}")
+    await hass.async_start()
+    return hass
+
+
+def _tracker_states(
+    rng: random.Random, count: int
+) -> dict[str, tuple[float, float]]:
+    """Return random start positions for the tracker fleet."""
+    return {
+        f"device_tracker.soak_{i}": (
+            rng.uniform(MIN_LAT, MAX_LAT),
+            rng.uniform(MIN_LON, MAX_LON),
+        )
+        for i in range(count)
+    }
+
+
+@callback
+def _async_set_tracker(
+    hass: HomeAssistant, entity_id: str, lat: float, lon: float
+) -> None:
+    """Write a GPS device_tracker state."""
+    hass.states.async_set(
+        entity_id,
+        "not_home",
+        {"latitude": lat, "longitude": lon, "source_type": "gps"},
+    )
+
+
+async def _async_move_trackers(
+    hass: HomeAssistant,
+    rng: random.Random,
+    positions: dict[str, tuple[float, float]],
+    rate: float,
+) -> None:
+    """Move random trackers at the requested overall update rate."""
+    entity_ids = list(positions)
+    while True:
+        await asyncio.sleep(1 / rate)
+        entity_id = rng.choice(entity_ids)
+        lat, lon = positions[entity_id]
+        lat = min(MAX_LAT, max(MIN_LAT, lat + rng.uniform(-0.01, 0.01)))
+        lon = min(MAX_LON, max(MIN_LON, lon + rng.uniform(-0.01, 0.01)))
+        positions[entity_id] = (lat, lon)
+        _async_set_tracker(hass, entity_id, lat, lon)
+
+
+async def async_wait_first_refresh(hass: HomeAssistant, entry_id: str) -> None:
+    """Wait for the first refresh that setup runs in the background."""
+    entry_data = hass.data[DOMAIN][entry_id]
+    refreshed = asyncio.Event()
+    remove_listener = entry_data["coordinator"].async_add_listener(
+        refreshed.set
+    )
+    try:
+        if not entry_data["fetcher"].has_data:
+            await refreshed.wait()
+        else:
+            # Fetched already; wait until matching and the listeners ran
+            async with entry_data["update_lock"]:
+                pass
+    finally:
+        remove_listener()
+    await hass.async_block_till_done()
+
+
+async def async_run(args: argparse.Namespace) -> int:
+    """Run the soak test and return the process exit status."""
+    # pylint: disable-next=import-outside-toplevel
+    from custom_components.be_alert import sources
+
+    rng = random.Random(args.seed)
+    feed = SyntheticFeed(rng, args.alerts, args.churn)
+    feed_runner, feed_url = await _async_start_feed(feed)
+    # Point the real source at the local stand-in
+    sources.PublicAlertsBeSource.url = feed_url
+
+    with ExitStack() as stack:
+        tmp = stack.enter_context(tempfile.TemporaryDirectory())
+        hass = await _async_setup_hass(Path(tmp))
+        positions = _tracker_states(rng, args.trackers)
+        for entity_id, (lat, lon) in positions.items():
+            _async_set_tracker(hass, entity_id, lat, lon)
+
+        writes = 0
+        changes = 0
+        async_set = StateMachine.async_set
+
+        def _counting_async_set(
+            states: StateMachine, entity_id: str, *args: Any, **kwargs: Any
+        ) -> None:
+            """Count state writes of everything but the fleet itself."""
+            nonlocal writes
+            if not entity_id.startswith("device_tracker."):
+                writes += 1
+            async_set(states, entity_id, *args, **kwargs)
+
+        @callback
+        def _count_change(event: Event) -> None:
+            nonlocal changes
+            if not event.data["entity_id"].startswith("device_tracker."):
+                changes += 1
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, _count_change)
+        stack.enter_context(
+            patch.object(StateMachine, "async_set", _counting_async_set)
+        )
+
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="BE Alert",
+            data={},
+            source="user",
+            options={
+                "sensors": [{"type": "all"}]
+                + [
+                    {"type": "device", "entity_id": entity_id}
+                    for entity_id in positions
+                ]
+            },
+        )
+        setup_start = time.perf_counter()
+        await hass.config_entries.async_add(entry)
+        await hass.async_block_till_done()
+        setup_time = time.perf_counter() - setup_start
+        # async_block_till_done does not wait for background tasks
+        await async_wait_first_refresh(hass, entry.entry_id)
+        first_refresh_time = time.perf_counter() - setup_start
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        fetcher = hass.data[DOMAIN][entry.entry_id]["fetcher"]
+        coordinator.update_interval = timedelta(
+            seconds=args.refresh_interval
+        )
+        # The first refresh scheduled the next one with the configured
+        # interval; refresh once more to switch to the soak interval
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        memory_start = _rss_mb()
+        writes = changes = 0
+        requests_start = feed.requests
+        suppressed_start = fetcher.suppressed_writes
+        monitor = LagMonitor()
+        monitor.start()
+        mover = hass.async_create_background_task(
+            _async_move_trackers(hass, rng, positions, args.move_rate),
+            "be_alert soak tracker mover",
+        )
+        await asyncio.sleep(args.duration)
+        mover.cancel()
+        monitor.stop()
+        memory_end = _rss_mb()
+        refreshes = max(1, feed.requests - requests_start)
+        suppressed = fetcher.suppressed_writes - suppressed_start
+
+        await hass.async_stop()
+    await feed_runner.cleanup()
+    # Unretrieved task exceptions are only reported once collected
+    gc.collect()
+    await asyncio.sleep(0)
+
+    lag_p50 = monitor.percentile(50)
+    lag_p95 = monitor.percentile(95)
+    lag_p99 = monitor.percentile(99)
+    lag_max = max(monitor.samples, default=0.0)
+    growth = memory_end - memory_start
+    writes_per_refresh = writes / refreshes
+    max_writes = args.max_writes_per_refresh
+    if max_writes is None:
+        max_writes = 2 * args.trackers + args.alerts
+
+    print(f"setup time:        {setup_time * 1000:.0f} ms")
+    print(f"first refresh:     {first_refresh_time * 1000:.0f} ms")
+    print(f"refreshes:         {refreshes}")
+    print(
+        f"loop lag (ms):     p50={lag_p50:.1f} p95={lag_p95:.1f} "
+        f"p99={lag_p99:.1f} max={lag_max:.1f} "
+        f"mean={statistics.fmean(monitor.samples or [0]):.1f}"
+    )
+    print(
+        f"memory (MiB):      start={memory_start:.1f} end={memory_end:.1f} "
+        f"growth={growth:.1f}"
+    )
+    print(
+        f"state writes:      total={writes} "
+        f"per refresh={writes_per_refresh:.1f}"
+    )
+    print(
+        f"state changes:     total={changes} "
+        f"per refresh={changes / refreshes:.1f}"
+    )
+    print(
+        f"suppressed writes: total={suppressed} "
+        f"per refresh={suppressed / refreshes:.1f}"
+    )
+
+    failures = []
+    if lag_p99 > args.max_lag_p99_ms:
+        failures.append(f"p99 lag {lag_p99:.1f} > {args.max_lag_p99_ms} ms")
+    if lag_max > args.max_lag_ms:
+        failures.append(f"max lag {lag_max:.1f} > {args.max_lag_ms} ms")
+    if growth > args.max_memory_growth_mb:
+        failures.append(
+            f"memory growth {growth:.1f} > {args.max_memory_growth_mb} MiB"
+        )
+    if writes_per_refresh > max_writes:
+        failures.append(
+            f"{writes_per_refresh:.1f} state writes per refresh > "
+            f"{max_writes}"
+        )
+    for failure in failures:
+        print(f"BUDGET EXCEEDED: {failure}")
+    return 1 if failures else 0
+
+
+def main() -> int:
+    """Run the soak test."""
+    args = _parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+    sys.path.insert(0, str(REPO_ROOT))
+    status = asyncio.run(async_run(args))
+    print(f"errors logged:     {len(errors.records)}")
+    if errors.records:
+        for record in errors.records[:5]:
+            message = record.getMessage().splitlines()[0]
+            print(f"ERROR: {record.name}: {message}")
+        return 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())